@@ -1,28 +1,99 @@
+import asyncio
+
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 
 from .calendar_agent_team import calendar_agent_team
-from .utils.weather_tools import get_current_weather
-from .utils.location_tools import get_current_location, get_coords_for_place
+from .utils.async_tools import get_current_weather, get_current_location, get_coords_for_place
+from .utils.geocode_cache import normalize_place
+from .utils.tool_metrics import instrument_tool, start_metrics_exporter
+from .utils.agent_tracing import tracing_callbacks
+
+# Most geocode/weather lookups in flight at once for a multi-place request
+MAX_CONCURRENT_PLACE_LOOKUPS = 8
 
-def get_current_weather_for_place(place:str)-> dict: 
+async def get_current_weather_for_place(place:str)-> dict: 
     """Gets the current weather for a named place
     Args: place (str) - place or city name."""
-    coords = get_coords_for_place(place)
-    current_weather = get_current_weather(coords)
+    coords = await get_coords_for_place(place)
+    current_weather = await get_current_weather(coords)
     return current_weather
 
 
-def get_current_local_weather():
+async def get_current_local_weather():
     """Gets the current, local weather"""
-    current_location = get_current_location()
+    current_location = await get_current_location()
     current_coords = {"lat" : current_location["lat"], "lon" : current_location["lon"]}
-    local_weather_current = get_current_weather(current_coords)
+    local_weather_current = await get_current_weather(current_coords)
     return local_weather_current
 
-get_current_local_weather_tool = FunctionTool(get_current_local_weather)
-get_current_weather_for_place_tool = FunctionTool(get_current_weather_for_place)
-get_current_location_tool = FunctionTool(get_current_location)
+async def get_current_weather_for_places(places: list[str]) -> dict:
+    """Gets the current weather for several named places at once
+    Args: places (list of str) - place or city names."""
+    if not places:
+        return {"status": "error", "message": "No places provided"}
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PLACE_LOOKUPS)
+
+    async def geocode(place: str):
+        async with semaphore:
+            try:
+                return await get_coords_for_place(place)
+            except Exception as e:
+                return e
+
+    async def fetch_weather(coords: dict):
+        async with semaphore:
+            try:
+                return await get_current_weather(coords)
+            except Exception as e:
+                return {"status": "error", "message": str(e)}
+
+    # The same place asked for twice is only geocoded once
+    unique_places = {}
+    for place in places:
+        unique_places.setdefault(normalize_place(place), place)
+    unique_places = list(unique_places.values())
+    geocoded = await asyncio.gather(*(geocode(place) for place in unique_places))
+
+    results = []
+    locations = {}
+    for place, coords in zip(unique_places, geocoded):
+        if isinstance(coords, Exception):
+            results.append({"places": [place], "status": "error", "message": str(coords)})
+            continue
+
+        # Places that geocode to the same coordinates ('NYC', 'New York') share one result entry.
+        # Nearby but distinct places keep their own entries; the weather cache shares readings within a cell.
+        location = (float(coords["lat"]), float(coords["lon"]))
+        if location in locations:
+            locations[location]["places"].append(place)
+            continue
+
+        locations[location] = {"places": [place], "name": coords["name"], "coords": coords}
+        results.append(locations[location])
+
+    weather = await asyncio.gather(*(fetch_weather(entry["coords"]) for entry in locations.values()))
+    for entry, current_weather in zip(locations.values(), weather):
+        del entry["coords"]
+        entry.update(current_weather)
+
+    # Like the calendar batch tools, only report an error when no place got a weather reading
+    failed = sum(1 for entry in results if entry["status"] == "error")
+    return {
+        "status": "error" if failed == len(results) else "success",
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+
+get_current_local_weather_tool = FunctionTool(instrument_tool(get_current_local_weather))
+get_current_weather_for_place_tool = FunctionTool(instrument_tool(get_current_weather_for_place))
+get_current_weather_for_places_tool = FunctionTool(instrument_tool(get_current_weather_for_places))
+get_current_location_tool = FunctionTool(instrument_tool(get_current_location))
+
+# Writes tool metrics to TOOL_METRICS_EXPORT_PATH when it is set
+start_metrics_exporter()
 
 
 root_agent = Agent(
@@ -43,7 +114,8 @@ root_agent = Agent(
         "Do NOT ask calendar_agent_team for any weather information. "
         
         "Current local weather -> invoke get_current_local_weather_tool. "
-        "Current weather for a named place -> invoke get_current_weather_tool"
+        "Current weather for a named place -> invoke get_current_weather_tool. "
+        "Current weather for more than one named place -> invoke get_current_weather_for_places_tool once with all of the places. "
 
         "To get the current_location, invoke get_current_location_tool. "
 
@@ -52,5 +124,6 @@ root_agent = Agent(
 
     ),
     sub_agents=[calendar_agent_team],
-    tools=[get_current_location_tool, get_current_local_weather_tool, get_current_weather_for_place_tool]
+    tools=[get_current_location_tool, get_current_local_weather_tool, get_current_weather_for_place_tool, get_current_weather_for_places_tool],
+    **tracing_callbacks
 )
@@ -2,16 +2,29 @@ from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 
 from .utils.math_and_time_tools import (
-    math_tool, get_current_date_and_time, get_relative_date_and_time,
-    format_time_to_calendar, calculate_time_duration_hours
+    math_tool, math_tool_batch, get_current_date_and_time, get_relative_date_and_time,
+    resolve_time_window, format_time_to_calendar, calculate_time_duration_hours
 )
-from .utils.calendar_tools import get_events, schedule_new_event, cancel_event
-
-get_events_tool = FunctionTool(get_events)
-schedule_new_event_tool = FunctionTool(schedule_new_event)
-cancel_event_tool = FunctionTool(cancel_event)
-
-math_tool = FunctionTool(math_tool)
+from .utils.async_tools import (
+    get_calendars, get_events, schedule_new_event, cancel_event, schedule_new_events, cancel_events,
+    find_free_slots, total_free_hours, summarize_time_usage
+)
+from .utils.tool_metrics import instrument_tool
+from .utils.agent_tracing import tracing_callbacks
+
+get_calendars_tool = FunctionTool(instrument_tool(get_calendars))
+get_events_tool = FunctionTool(instrument_tool(get_events))
+schedule_new_event_tool = FunctionTool(instrument_tool(schedule_new_event))
+cancel_event_tool = FunctionTool(instrument_tool(cancel_event))
+schedule_new_events_tool = FunctionTool(instrument_tool(schedule_new_events))
+cancel_events_tool = FunctionTool(instrument_tool(cancel_events))
+find_free_slots_tool = FunctionTool(instrument_tool(find_free_slots))
+total_free_hours_tool = FunctionTool(instrument_tool(total_free_hours))
+summarize_time_usage_tool = FunctionTool(instrument_tool(summarize_time_usage))
+resolve_time_window_tool = FunctionTool(instrument_tool(resolve_time_window))
+
+math_tool = FunctionTool(instrument_tool(math_tool))
+math_tool_batch = FunctionTool(instrument_tool(math_tool_batch))
 
 math_and_time_utility_agent = Agent(
     name="math_and_time_utility_agent",
@@ -25,6 +38,8 @@ math_and_time_utility_agent = Agent(
         "Once an instruction is complete, pass the results as structured JSON to the calendar_agent_team. "
         "Use get_current_date_and_time for today, get_relative_date_and_time for relative times, "
         "calculate_time_duration_hours for durations, and format_time_to_calendar for time deltas. "
+        "To evaluate the same calculation for several sets of values, invoke math_tool_batch once instead of calling math_tool repeatedly. "
+        "To resolve a period or day ('next week', 'this month', 'next Tuesday', 'tomorrow evening'), invoke resolve_time_window once; it already applies the rules below and needs no other time tools. "
         "To calculate natural language deltas (e.g., 'in 3 hours', 'next Tuesday', 'tomorrow morning'), first get get_current_date_and_time, "
         "then resolve the time delta using get_relative_date_and_time. "
         "To understand what is meant by 'early', 'mid-morning', 'late' and any other abstract or vague terms, invoke get_relative_date_and_time. "
@@ -46,9 +61,10 @@ math_and_time_utility_agent = Agent(
 
     ),
     tools=[
-        get_current_date_and_time, get_relative_date_and_time,
-        math_tool, calculate_time_duration_hours, format_time_to_calendar
-    ]
+        instrument_tool(get_current_date_and_time), instrument_tool(get_relative_date_and_time), resolve_time_window_tool,
+        math_tool, math_tool_batch, instrument_tool(calculate_time_duration_hours), instrument_tool(format_time_to_calendar)
+    ],
+    **tracing_callbacks
 )
 
 calendar_interaction_agent = Agent(
@@ -59,24 +75,34 @@ calendar_interaction_agent = Agent(
         "If unable to complete a task, return directly to the calender_interaction_team. "
 
         "To cancel events, first get the events, then use the returned event_id properties to invoke cancel_event. "
+        "To cancel more than one event, invoke cancel_events_tool once with all of the event IDs. "
+        "To schedule more than one event, invoke schedule_new_events_tool once with all of the events. "
 
         "For scheduling without an explicit start time, default start time is 9am. "
         "For scheduling without an explicit end time, default duration is 1 hour. "
 
-        "To resolve any natural language deltas or times you must invoke the math_and_time_utility_agent. "
-        "For scheduling an event with a vague timeframe, such as 'Monday Evening', 'tomorrow morning', 'the evening', you should first resolve the current time, then resolve the meaning of the vague time you were provided. You must then check for events in that period. You must then suggest a time to the user, within a range of time with no events scheduled.. "
+        "To resolve a period or day ('next week', 'this month', 'last Friday', 'next Tuesday', 'tomorrow evening'), invoke resolve_time_window_tool directly and use its start and end (or its midpoint for a single time). "
+        "To resolve any other natural language deltas or times you must invoke the math_and_time_utility_agent. "
+        "For scheduling an event with a vague timeframe, such as 'Monday Evening', 'tomorrow morning', 'the evening', you should first resolve the current time, then resolve the meaning of the vague time you were provided. You must then invoke find_free_slots_tool for that period, and suggest one of the returned free slots to the user. "
         "If unsure about the specifiec date or time, return to the calendar_agent_team. "
         "Never respond directly to the user. Only call tools. "
         "Use get_events_tool to fetch events and schedule_new_event_tool to add events. "
-        "Free time is total hours with no events scheduled. "
+        "schedule_new_event_tool and schedule_new_events_tool check for clashing events themselves, so do not fetch events before scheduling. If an event comes back with conflicts, it was not booked: return the conflicts and the alternatives to the calendar_agent_team so the user can choose. "
+        "Only set allow_conflicts to true (per event for schedule_new_events_tool) when the user has said to book over the existing events. "
+        "Events come from the primary calendar unless calendar IDs are given. To see the user's other calendars (shared, team, holiday, resource), invoke get_calendars_tool. "
+        "To get events from several calendars, invoke get_events_tool once with all of their IDs in calendar_ids (or ['all']) instead of once per calendar. "
+        "To cancel an event that is not on the primary calendar, pass the calendar_id it was returned with. "
+        "Free time is total hours with no events scheduled. To get free time, invoke total_free_hours_tool. To find free slots, invoke find_free_slots_tool. Do not work out free time from a list of events yourself. "
+        "For how much time events take up (e.g. 'how many hours of meetings do I have this week?'), invoke summarize_time_usage_tool once for the whole period instead of adding up event durations one at a time. "
         "For scheduling on a named day without an explicit date, use the first upcoming instance after today. "
         "For day/date calculations, invoke math_and_time_utility_agent. "
-        "If asked any command or question with a natural language or ISO 8601 duration ('P1D', 'next Tuesday', 'Monday last', 'A week tomorrow', '2 days before' etc.), first resolve the target date/time by invoking the math_and_time_utility_agent before continuing. "
+        "If asked any command or question with a natural language or ISO 8601 duration that resolve_time_window_tool cannot resolve ('P1D', 'Monday last', 'A week tomorrow', '2 days before' etc.), first resolve the target date/time by invoking the math_and_time_utility_agent before continuing. "
         "Always assume the user refers to a date in the future when scheduling events. Never schedule an event for a day previous to the current day. "
 
         "YOU **** MUST NEVER **** INTERACT WITH THE USER!! DO NOT INTERRUPT THE FLOW OF AGENTS. WHEN YOU HAVE A RETURN FROM ANY FUNCTION, INFORM THE AGENT ABOVE YOU. "
     ),
-    tools=[get_events_tool, schedule_new_event_tool, cancel_event_tool],
+    tools=[get_calendars_tool, get_events_tool, schedule_new_event_tool, cancel_event_tool, schedule_new_events_tool, cancel_events_tool, find_free_slots_tool, total_free_hours_tool, summarize_time_usage_tool, resolve_time_window_tool],
+    **tracing_callbacks
 )
 
 calendar_agent_team = Agent(
@@ -92,13 +118,15 @@ calendar_agent_team = Agent(
         "If unable to complete a task, sub agents should return to the root agent (personal_assistant_agent) . "
         "To get, cancel or schedule events, invoke calendar_interaction_agent. "
         "For date/time calculations, invoke math_and_time_utility_agent. "
-        "Use math_and_time_utility_agent to calculate durations, free time, and relative dates. "
+        "Use math_and_time_utility_agent to calculate durations and relative dates. "
+        "To get free time, find free slots or total up time spent in events, invoke calendar_interaction_agent. "
 
         "For scheduling without an explicit start time, default start time is 9am. "
         "For scheduling without an explicit end time, default duration is 1 hour. "
 
         "Upon executing a full user prompt operation cycle, the calendar_agent_team should return the results to the root agent (personal_assistant_agent). "
 
+        "calendar_interaction_agent resolves periods such as 'next week', 'this month' and 'next Tuesday evening' itself with resolve_time_window_tool, so pass these phrases to it unchanged. "
         "When given a time-region without timestamps ('next week', 'next month' etc.) use these examples to resolve the desired time start and end:"
         "Examples: "
         "'Next Tuesday' = 1. Get the current time with math_and_time_utility_agent. 2. Find the soonest Tuesday in the future AFTER the current time. "
@@ -108,5 +136,6 @@ calendar_agent_team = Agent(
         "Scheduling on a weekday without a given date defaults to the next occurrence of that day name AFTER today."
         "Never schedule events in the past! "
     ),
-    sub_agents=[calendar_interaction_agent, math_and_time_utility_agent]
+    sub_agents=[calendar_interaction_agent, math_and_time_utility_agent],
+    **tracing_callbacks
 )
\ No newline at end of file
@@ -0,0 +1,298 @@
+"""
+Tracing for agent hops, model round-trips and tool calls across the delegation tree.
+
+AgentTracer hooks into the ADK agent, model and tool callbacks and records one span per agent hop,
+model call and tool call, linked parent -> child, grouped per turn (ADK invocation). When the first
+agent of a turn finishes, the turn is summarized per agent (hops, model calls and latency, token counts,
+tool calls) and, if configured, written out:
+    AGENT_TRACE_PATH         JSON lines, one turn per line: summary plus every span
+    AGENT_TRACE_FOLDED_PATH  folded stacks ('a;b;c <microseconds>'), the input format of flamegraph.pl and speedscope
+
+Register with Agent(..., **tracing_callbacks).
+"""
+import os
+import json
+import time
+import itertools
+import threading
+from collections import Counter, deque
+
+AGENT_TRACING_ENABLED = os.getenv("AGENT_TRACING_ENABLED", "true").lower() == "true"
+AGENT_TRACE_PATH = os.getenv("AGENT_TRACE_PATH")
+AGENT_TRACE_FOLDED_PATH = os.getenv("AGENT_TRACE_FOLDED_PATH")
+
+# Finished turns kept in memory for get_recent_turns
+AGENT_TRACE_HISTORY = int(os.getenv("AGENT_TRACE_HISTORY", "50"))
+
+# Turns whose first agent never finished (e.g. the run was cancelled) are dropped, oldest first, past this many
+MAX_OPEN_TURNS = 256
+
+
+class Span:
+    """One agent hop, model call or tool call."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, kind: str, name: str, agent: str, parent=None):
+        self.span_id = next(Span._ids)
+        self.parent = parent
+        self.kind = kind
+        self.name = name
+        self.agent = agent
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms = None
+        self.attributes = {}
+        self.children = []
+        if parent is not None:
+            parent.children.append(self)
+
+    def finish(self, **attributes) -> None:
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter() - self._started) * 1000
+        self.attributes.update(attributes)
+
+    @property
+    def self_ms(self) -> float:
+        """Time not covered by child spans."""
+        return max((self.duration_ms or 0.0) - sum(child.duration_ms or 0.0 for child in self.children), 0.0)
+
+    @property
+    def frame(self) -> str:
+        return self.name if self.kind == "agent" else f"{self.kind}:{self.name}"
+
+    def to_dict(self) -> dict:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "kind": self.kind,
+            "name": self.name,
+            "agent": self.agent,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            **self.attributes,
+        }
+
+
+class TurnTrace:
+    """Spans for one invocation. Agent spans form a stack, since sub-agents run inside their parent's hop."""
+
+    def __init__(self, invocation_id: str):
+        self.invocation_id = invocation_id
+        self.spans = []
+        self.agent_stack = []
+        self.model_spans = {}
+        self.tool_spans = {}
+
+    def start(self, kind: str, name: str, agent: str, parent=None) -> Span:
+        span = Span(kind, name, agent, parent)
+        self.spans.append(span)
+        return span
+
+    def current_agent_span(self, agent: str):
+        for span in reversed(self.agent_stack):
+            if span.name == agent:
+                return span
+        return self.agent_stack[-1] if self.agent_stack else None
+
+
+def usage_counts(llm_response) -> dict:
+    usage = getattr(llm_response, "usage_metadata", None)
+    if usage is None:
+        return {}
+    return {
+        "prompt_tokens": usage.prompt_token_count or 0,
+        "output_tokens": usage.candidates_token_count or 0,
+        "total_tokens": usage.total_token_count or 0,
+    }
+
+
+def summarize_turn(trace: TurnTrace) -> dict:
+    """Per-agent hops, model latency, tokens and tool calls for a turn, plus the order agents were entered in."""
+    agents = {}
+    for span in trace.spans:
+        stats = agents.setdefault(span.agent, {
+            "hops": 0, "agent_ms": 0.0, "model_calls": 0, "model_ms": 0.0,
+            "prompt_tokens": 0, "output_tokens": 0, "tool_calls": Counter(), "tool_ms": 0.0,
+        })
+        duration = span.duration_ms or 0.0
+        if span.kind == "agent":
+            stats["hops"] += 1
+            stats["agent_ms"] += duration
+        elif span.kind == "model":
+            stats["model_calls"] += 1
+            stats["model_ms"] += duration
+            stats["prompt_tokens"] += span.attributes.get("prompt_tokens", 0)
+            stats["output_tokens"] += span.attributes.get("output_tokens", 0)
+        else:
+            stats["tool_calls"][span.name] += 1
+            stats["tool_ms"] += duration
+
+    for stats in agents.values():
+        for key in ("agent_ms", "model_ms", "tool_ms"):
+            stats[key] = round(stats[key], 3)
+        stats["tool_calls"] = dict(stats["tool_calls"])
+
+    root = trace.spans[0] if trace.spans else None
+    path = [span.name for span in trace.spans if span.kind == "agent"]
+    return {
+        "invocation_id": trace.invocation_id,
+        "started_at": root.started_at if root else None,
+        "duration_ms": round(root.duration_ms or 0.0, 3) if root else 0.0,
+        "agent_hops": len(path),
+        "delegation_path": path,
+        "repeated_agents": sorted(name for name, count in Counter(path).items() if count > 1),
+        "model_calls": sum(stats["model_calls"] for stats in agents.values()),
+        "model_ms": round(sum(stats["model_ms"] for stats in agents.values()), 3),
+        "prompt_tokens": sum(stats["prompt_tokens"] for stats in agents.values()),
+        "output_tokens": sum(stats["output_tokens"] for stats in agents.values()),
+        "tool_calls": sum(sum(stats["tool_calls"].values()) for stats in agents.values()),
+        "agents": agents,
+    }
+
+
+def folded_stacks(trace: TurnTrace) -> list:
+    """'root;child;leaf <self time in microseconds>' lines, merged per stack."""
+    totals = Counter()
+    for span in trace.spans:
+        frames = []
+        node = span
+        while node is not None:
+            frames.append(node.frame)
+            node = node.parent
+        totals[";".join(reversed(frames))] += round(span.self_ms * 1000)
+    return [f"{stack} {micros}" for stack, micros in totals.items() if micros > 0]
+
+
+class AgentTracer:
+
+    def __init__(self, trace_path: str = AGENT_TRACE_PATH, folded_path: str = AGENT_TRACE_FOLDED_PATH,
+                 history: int = AGENT_TRACE_HISTORY):
+        self.trace_path = trace_path
+        self.folded_path = folded_path
+        self.recent_turns = deque(maxlen=history)
+        self._turns = {}
+        self._lock = threading.Lock()
+
+    def _trace(self, context) -> TurnTrace:
+        with self._lock:
+            trace = self._turns.get(context.invocation_id)
+            if trace is None:
+                if len(self._turns) >= MAX_OPEN_TURNS:
+                    self._turns.pop(next(iter(self._turns)))
+                trace = self._turns[context.invocation_id] = TurnTrace(context.invocation_id)
+            return trace
+
+    # ---------------- ADK callbacks (all return None, so nothing is overridden) ----------------
+
+    def before_agent(self, callback_context):
+        trace = self._trace(callback_context)
+        parent = trace.agent_stack[-1] if trace.agent_stack else None
+        agent = callback_context.agent_name
+        trace.agent_stack.append(trace.start("agent", agent, agent, parent))
+        return None
+
+    def after_agent(self, callback_context):
+        trace = self._trace(callback_context)
+        span = trace.current_agent_span(callback_context.agent_name)
+        if span is not None:
+            span.finish()
+            trace.agent_stack.remove(span)
+        if not trace.agent_stack:
+            self._finish_turn(trace)
+        return None
+
+    def before_model(self, callback_context, llm_request):
+        trace = self._trace(callback_context)
+        agent = callback_context.agent_name
+        model = getattr(llm_request, "model", None) or "model"
+        trace.model_spans[agent] = trace.start("model", model, agent, trace.current_agent_span(agent))
+        return None
+
+    def after_model(self, callback_context, llm_response):
+        # Streaming sends partial responses first; the call ends with the final one
+        if getattr(llm_response, "partial", False):
+            return None
+        span = self._trace(callback_context).model_spans.pop(callback_context.agent_name, None)
+        if span is not None:
+            span.finish(**usage_counts(llm_response))
+        return None
+
+    def on_model_error(self, callback_context, llm_request, error):
+        span = self._trace(callback_context).model_spans.pop(callback_context.agent_name, None)
+        if span is not None:
+            span.finish(error=type(error).__name__)
+        return None
+
+    def before_tool(self, tool, args, tool_context):
+        trace = self._trace(tool_context)
+        agent = tool_context.agent_name
+        key = tool_context.function_call_id or tool.name
+        trace.tool_spans[key] = trace.start("tool", tool.name, agent, trace.current_agent_span(agent))
+        return None
+
+    def after_tool(self, tool, args, tool_context, tool_response):
+        span = self._trace(tool_context).tool_spans.pop(tool_context.function_call_id or tool.name, None)
+        if span is not None:
+            status = tool_response.get("status") if isinstance(tool_response, dict) else None
+            span.finish(**({"status": status} if status else {}))
+        return None
+
+    def on_tool_error(self, tool, args, tool_context, error):
+        span = self._trace(tool_context).tool_spans.pop(tool_context.function_call_id or tool.name, None)
+        if span is not None:
+            span.finish(status="exception", error=type(error).__name__)
+        return None
+
+    # ---------------- Turn results ----------------
+
+    def _finish_turn(self, trace: TurnTrace) -> None:
+        with self._lock:
+            self._turns.pop(trace.invocation_id, None)
+
+        # Spans still open (e.g. cut short by an error) end with the turn
+        for span in trace.spans:
+            span.finish()
+
+        summary = summarize_turn(trace)
+        spans = [span.to_dict() for span in trace.spans]
+        folded = folded_stacks(trace)
+        self.recent_turns.append({"summary": summary, "spans": spans, "folded": folded})
+
+        try:
+            if self.trace_path:
+                with open(self.trace_path, "a") as file:
+                    file.write(json.dumps({"summary": summary, "spans": spans}) + "\n")
+            if self.folded_path and folded:
+                with open(self.folded_path, "a") as file:
+                    file.write("\n".join(folded) + "\n")
+        except OSError:
+            # Tracing must never break a turn
+            pass
+
+    def get_recent_turns(self) -> list:
+        return list(self.recent_turns)
+
+    def callbacks(self) -> dict:
+        """Keyword arguments for Agent(...) that hook this tracer in; empty when tracing is disabled."""
+        if not AGENT_TRACING_ENABLED:
+            return {}
+        return {
+            "before_agent_callback": self.before_agent,
+            "after_agent_callback": self.after_agent,
+            "before_model_callback": self.before_model,
+            "after_model_callback": self.after_model,
+            "on_model_error_callback": self.on_model_error,
+            "before_tool_callback": self.before_tool,
+            "after_tool_callback": self.after_tool,
+            "on_tool_error_callback": self.on_tool_error,
+        }
+
+
+agent_tracer = AgentTracer()
+tracing_callbacks = agent_tracer.callbacks()
+
+
+def get_recent_turns() -> list:
+    """Summaries, spans and folded stacks of the most recent finished turns."""
+    return agent_tracer.get_recent_turns()
@@ -0,0 +1,14 @@
+import os
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Load environment variables
+env_path = Path(__file__).resolve().parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+def get_maps_api_key() -> str:
+    """Read the API key when a tool runs, so a missing key fails that call rather than the import."""
+    api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        raise ValueError("Missing GOOGLE_MAPS_API_KEY in .env file")
+    return api_key
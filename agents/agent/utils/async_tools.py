@@ -0,0 +1,50 @@
+"""
+Async versions of the blocking agent tools, for the async ADK runner.
+
+googleapiclient and requests are blocking, so each call runs on a bounded thread pool
+and the event loop stays free to serve other sessions while it waits.
+Tools keep their names, signatures and docstrings, so the model sees the same tool definitions.
+"""
+import os
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from . import calendar_tools, free_busy_tools, location_tools, time_usage_tools, weather_tools
+
+TOOL_EXECUTOR_WORKERS = int(os.getenv("TOOL_EXECUTOR_WORKERS", "16"))
+
+tool_executor = ThreadPoolExecutor(max_workers=TOOL_EXECUTOR_WORKERS, thread_name_prefix="agent-tool")
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run a blocking function on the tool executor, carrying over the caller's context variables."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(tool_executor, functools.partial(context.run, fn, *args, **kwargs))
+
+
+def make_async(fn):
+    """Async wrapper for a blocking tool that keeps its name, signature and docstring."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await run_blocking(fn, *args, **kwargs)
+    return wrapper
+
+
+get_calendars = make_async(calendar_tools.get_calendars)
+get_events = make_async(calendar_tools.get_events)
+schedule_new_event = make_async(calendar_tools.schedule_new_event)
+cancel_event = make_async(calendar_tools.cancel_event)
+schedule_new_events = make_async(calendar_tools.schedule_new_events)
+cancel_events = make_async(calendar_tools.cancel_events)
+
+find_free_slots = make_async(free_busy_tools.find_free_slots)
+total_free_hours = make_async(free_busy_tools.total_free_hours)
+summarize_time_usage = make_async(time_usage_tools.summarize_time_usage)
+
+get_current_location = make_async(location_tools.get_current_location)
+get_coords_for_place = make_async(location_tools.get_coords_for_place)
+
+get_current_weather = make_async(weather_tools.get_current_weather)
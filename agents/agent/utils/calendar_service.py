@@ -0,0 +1,112 @@
+import os
+import re
+import json
+import threading
+from contextlib import contextmanager
+
+from .http_client import endpoint_name, timed_request
+
+CALENDAR_API_NAME = "calendar"
+CALENDAR_API_VERSION = "v3"
+HTTP_TIMEOUT_SECONDS = 30
+MAX_IDLE_SERVICES_PER_CREDENTIAL = 8
+
+# Point the Calendar client at another server (e.g. the offline benchmark's stand-in) instead of googleapis.com
+CALENDAR_API_ENDPOINT = os.getenv("CALENDAR_API_ENDPOINT")
+
+# Event and calendar IDs are folded out of upstream latency labels, which would otherwise grow without bound
+CALENDAR_PATH_IDS = [
+    (re.compile(r"/calendars/[^/?]+"), "/calendars/{calendarId}"),
+    (re.compile(r"/events/(?!watch|import|quickAdd)[^/?]+"), "/events/{eventId}"),
+]
+
+_lock = threading.Lock()
+_discovery_document = None
+_service_pools = {}
+
+
+def get_discovery_document() -> dict:
+    """Load and parse the Calendar discovery document bundled with googleapiclient (once per process)."""
+    global _discovery_document
+
+    if _discovery_document is None:
+        from googleapiclient.discovery_cache import get_static_doc
+
+        with _lock:
+            if _discovery_document is None:
+                document = get_static_doc(CALENDAR_API_NAME, CALENDAR_API_VERSION)
+                if document is None:
+                    raise RuntimeError("Bundled Calendar discovery document not found in googleapiclient")
+                _discovery_document = json.loads(document)
+
+    return _discovery_document
+
+
+def credential_key(creds) -> tuple:
+    """Identify the account behind a credentials object, ignoring short-lived access tokens."""
+    identity = (
+        getattr(creds, "service_account_email", None)
+        or getattr(creds, "client_id", None)
+        or id(creds)
+    )
+    return (type(creds).__name__, identity, getattr(creds, "refresh_token", None))
+
+
+def calendar_endpoint(uri: str) -> str:
+    """Upstream latency label for a Calendar API request, e.g. 'www.googleapis.com/calendar/v3/calendars/{calendarId}/events'."""
+    endpoint = endpoint_name(uri)
+    for pattern, replacement in CALENDAR_PATH_IDS:
+        endpoint = pattern.sub(replacement, endpoint)
+    return endpoint
+
+
+def _build_service(creds):
+    # googleapiclient.discovery and the auth transports are slow to import, so load them on first use
+    import httplib2
+    import google_auth_httplib2
+    from googleapiclient.discovery import build_from_document
+
+    transport = httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+    # Record Calendar round-trips in the same upstream latency histograms as the requests-based APIs
+    transport.request = timed_request(transport.request, calendar_endpoint)
+    http = google_auth_httplib2.AuthorizedHttp(creds, http=transport)
+    client_options = {"api_endpoint": CALENDAR_API_ENDPOINT} if CALENDAR_API_ENDPOINT else None
+    return build_from_document(get_discovery_document(), http=http, client_options=client_options)
+
+
+@contextmanager
+def calendar_service(creds):
+    """
+    Check out a Calendar API service for the given credentials.
+
+    Services (and their keep-alive HTTP connections) are pooled per credential.
+    A checked-out service is used by one thread at a time, since httplib2 is not thread-safe.
+    """
+    key = credential_key(creds)
+
+    with _lock:
+        pool = _service_pools.setdefault(key, [])
+        service = pool.pop() if pool else None
+
+    if service is None:
+        service = _build_service(creds)
+    else:
+        # Always send the caller's (freshest) token on the pooled transport
+        service._http.credentials = creds
+
+    try:
+        yield service
+    finally:
+        with _lock:
+            # Services checked out before an invalidation are discarded, not returned
+            if _service_pools.get(key) is pool and len(pool) < MAX_IDLE_SERVICES_PER_CREDENTIAL:
+                pool.append(service)
+
+
+def invalidate_calendar_service(creds=None) -> None:
+    """Drop pooled services for one credential, or for all credentials when creds is None."""
+    with _lock:
+        if creds is None:
+            _service_pools.clear()
+        else:
+            _service_pools.pop(credential_key(creds), None)
@@ -1,15 +1,369 @@
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import datetime
-import dateparser
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from .handle_credentials import get_creds
-from .math_and_time_tools import format_time_to_calendar, get_current_date_and_time, get_local_timezone, get_relative_date_and_time, parse_iso_duration
+from .cache import TTLCache
+from .calendar_service import calendar_service, credential_key
+from .event_store import EventMirror, EVENT_MIRROR_PATH, event_time_to_timestamp
+from .event_projection import compact_event, compact_events, event_time
+from .recurrence import expand_events
+from .intervals import DEFAULT_WORKING_HOURS, IntervalIndex, busy_intervals_from_events, format_slot, working_periods
+from .math_and_time_tools import format_time_to_calendar, get_current_date_and_time, get_local_timezone, get_relative_date_and_time, parse_iso_duration, parse_datetime, to_calendar_time
+import os
 import re
+import sqlite3
 
-def get_events(start_time=None, end_time=None, max_results: int = 10) -> dict:
+USE_EVENT_MIRROR = os.getenv("USE_EVENT_MIRROR", "true").lower() == "true"
+
+DEFAULT_CALENDAR_ID = "primary"
+
+# Calendars read at once when get_events covers several of them
+CALENDAR_FETCH_WORKERS = int(os.getenv("CALENDAR_FETCH_WORKERS", "5"))
+
+# The calendar list rarely changes, so it is only re-read this often
+CALENDAR_LIST_TTL_SECONDS = 10 * 60
+CALENDAR_LIST_FIELDS = "nextPageToken,items(id,summary,summaryOverride,primary,accessRole,timeZone)"
+
+# Events per events().list page, and the most events get_events will ever return
+EVENTS_PAGE_SIZE = 250
+EVENTS_HARD_CAP = 500
+
+# Only request the event attributes the tools actually use
+EVENT_FIELDS = "id,iCalUID,status,summary,description,location,start,end,transparency,attendees(email,displayName,responseStatus),recurringEventId"
+
+# Fetch each recurring series once (singleEvents=False) and expand it locally, instead of the API sending every instance
+EXPAND_RECURRENCE_LOCALLY = os.getenv("EXPAND_RECURRENCE_LOCALLY", "false").lower() == "true"
+
+# Series are listed unordered, so a window is read in as few pages as possible
+SERIES_PAGE_SIZE = 2500
+SERIES_EVENT_FIELDS = EVENT_FIELDS + ",recurrence,originalStartTime"
+
+# How far either side of a new event conflict detection looks for free alternatives, and how many it offers
+CONFLICT_SEARCH_HOURS = 24
+MAX_ALTERNATIVE_SLOTS = 3
+
+# Most requests the Calendar API accepts in one batch HTTP request
+CALENDAR_BATCH_LIMIT = 50
+
+# Local copy of the primary calendar, used to answer get_events without a round-trip
+event_mirror = EventMirror(EVENT_MIRROR_PATH, calendar_id=DEFAULT_CALENDAR_ID, fields=EVENT_FIELDS)
+
+calendar_fetch_executor = ThreadPoolExecutor(max_workers=CALENDAR_FETCH_WORKERS, thread_name_prefix="calendar-fetch")
+calendar_list_cache = TTLCache(maxsize=64, ttl=CALENDAR_LIST_TTL_SECONDS)
+
+def iter_events(creds, time_min: str, time_max: str, calendar_id: str = DEFAULT_CALENDAR_ID,
+                page_size: int = EVENTS_PAGE_SIZE, max_results: int = None, fields: str = EVENT_FIELDS):
+    """
+    Lazily yield the events between time_min and time_max (calendar-formatted strings), in start time order.
+    Pages are only fetched as the caller consumes them, following nextPageToken until the
+    window is exhausted or max_results events have been yielded.
+    """
+    params = {
+        "calendarId": calendar_id,
+        "timeMin": time_min,
+        "timeMax": time_max,
+        "maxResults": page_size,
+        "singleEvents": True,
+        "orderBy": "startTime",
+        "fields": f"nextPageToken,items({fields})",
+    }
+
+    yielded = 0
+    with calendar_service(creds) as service:
+        while True:
+            if max_results is not None:
+                params["maxResults"] = min(page_size, max_results - yielded)
+
+            page = service.events().list(**params).execute()
+
+            for event in page.get("items", []):
+                yield event
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    return
+
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return
+            params["pageToken"] = page_token
+
+def list_series_events(creds, time_min: str, time_max: str, calendar_id: str = DEFAULT_CALENDAR_ID,
+                       fields: str = SERIES_EVENT_FIELDS) -> list:
+    """
+    The events between time_min and time_max with recurring series unexpanded: single events, series masters,
+    and modified or cancelled instances. Cancelled instances only come back with showDeleted=True.
+    """
+    params = {
+        "calendarId": calendar_id,
+        "timeMin": time_min,
+        "timeMax": time_max,
+        "maxResults": SERIES_PAGE_SIZE,
+        "singleEvents": False,
+        "showDeleted": True,
+        "fields": f"nextPageToken,items({fields})",
+    }
+
+    items = []
+    with calendar_service(creds) as service:
+        while True:
+            page = service.events().list(**params).execute()
+            items.extend(page.get("items", []))
+
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                break
+            params["pageToken"] = page_token
+
+    return items
+
+def iter_expanded_events(creds, time_min: str, time_max: str, calendar_id: str = DEFAULT_CALENDAR_ID,
+                         max_results: int = None, fields: str = SERIES_EVENT_FIELDS):
+    """Same events as iter_events, but recurring series are fetched once as their master event and expanded locally."""
+    items = list_series_events(creds, time_min, time_max, calendar_id=calendar_id, fields=fields)
+    events = expand_events(items, datetime.datetime.fromisoformat(time_min), datetime.datetime.fromisoformat(time_max))
+    return itertools.islice(events, max_results)
+
+def resolve_query_window(start_time=None, end_time=None) -> tuple:
+    """
+    Resolve optional start/end times (datetimes, ISO or natural language) into a query window.
+    Defaults from the current time to 1 week after the start.
+    Returns (start_dt, end_dt, start_time, end_time) with the times formatted for the Calendar API.
+    Raises ValueError if a given time cannot be parsed.
+    """
+    # Determine start_time
+    if start_time is None:
+        current_dt = get_current_date_and_time()
+        start_dt = current_dt["timestamp"]
+        start_time = current_dt["time_google_calendar"]
+    else:
+        start_dt = parse_datetime(start_time)
+        if start_dt is None:
+            raise ValueError(f"Could not parse start_time: {start_time}")
+        start_time = to_calendar_time(start_dt)
+
+    # Determine end_time
+    if end_time is None:
+        one_week_later = get_relative_date_and_time(start_dt, "P1W")
+        end_dt = one_week_later["timestamp"]
+        end_time = one_week_later["time_google_calendar"]
+    else:
+        end_dt = parse_datetime(end_time)
+        if end_dt is None:
+            raise ValueError(f"Could not parse end_time: {end_time}")
+        end_time = to_calendar_time(end_dt)
+
+    return start_dt, end_dt, start_time, end_time
+
+def query_events(creds, start_time: str, end_time: str, limit: int = None, calendar_id: str = DEFAULT_CALENDAR_ID) -> list:
+    """
+    Events between two calendar-formatted times, from the local mirror when enabled (primary calendar only),
+    otherwise from the API, with recurring series expanded locally when EXPAND_RECURRENCE_LOCALLY is set.
+    """
+    if USE_EVENT_MIRROR and calendar_id == DEFAULT_CALENDAR_ID:
+        return event_mirror.query(
+            creds,
+            datetime.datetime.fromisoformat(start_time),
+            datetime.datetime.fromisoformat(end_time),
+            limit=limit,
+        )
+    if EXPAND_RECURRENCE_LOCALLY:
+        return list(iter_expanded_events(creds, start_time, end_time, calendar_id=calendar_id, max_results=limit))
+    return list(iter_events(creds, start_time, end_time, calendar_id=calendar_id, max_results=limit))
+
+def list_calendars(creds) -> list:
+    """The user's calendars from calendarList, cached per account for CALENDAR_LIST_TTL_SECONDS."""
+    key = credential_key(creds)
+    calendars = calendar_list_cache.get(key)
+    if calendars is not None:
+        return calendars
+
+    calendars = []
+    params = {"fields": CALENDAR_LIST_FIELDS}
+    with calendar_service(creds) as service:
+        while True:
+            page = service.calendarList().list(**params).execute()
+            for item in page.get("items", []):
+                calendars.append({
+                    "id": item["id"],
+                    "name": item.get("summaryOverride") or item.get("summary"),
+                    "primary": item.get("primary", False),
+                    "access_role": item.get("accessRole"),
+                    "time_zone": item.get("timeZone"),
+                })
+
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                break
+            params["pageToken"] = page_token
+
+    calendar_list_cache.set(key, calendars)
+    return calendars
+
+def resolve_calendar_ids(creds, calendar_ids) -> list:
+    """Calendars to read: the primary calendar by default, every listed calendar for ['all']. Duplicates are dropped, order kept."""
+    if not calendar_ids:
+        return [DEFAULT_CALENDAR_ID]
+    if isinstance(calendar_ids, str):
+        calendar_ids = [calendar_ids]
+    if any(calendar_id.lower() == "all" for calendar_id in calendar_ids):
+        return [calendar["id"] for calendar in list_calendars(creds)]
+    return list(dict.fromkeys(calendar_ids))
+
+def merge_calendar_events(streams: dict, limit: int = None) -> list:
+    """
+    Heap-based k-way merge of per-calendar event lists (each already in start time order) into one list in start time order.
+    Each event is tagged with the calendars it is on; an event found on several calendars
+    (same iCalUID and start, e.g. a meeting on both your own and a team calendar) is kept once.
+    """
+    tagged = [zip(events, itertools.repeat(calendar_id)) for calendar_id, events in streams.items()]
+    merged = heapq.merge(*tagged, key=lambda item: event_time_to_timestamp(item[0]["start"]))
+
+    events = []
+    seen = {}
+    for event, calendar_id in merged:
+        key = (event.get("iCalUID") or event["id"], event_time(event["start"]))
+        if key in seen:
+            if calendar_id not in seen[key]["calendars"]:
+                seen[key]["calendars"].append(calendar_id)
+            continue
+
+        event["calendars"] = [calendar_id]
+        seen[key] = event
+        events.append(event)
+        if limit is not None and len(events) >= limit:
+            break
+
+    return events
+
+def query_calendars(creds, calendar_ids: list, start_time: str, end_time: str, limit: int = None) -> tuple:
+    """
+    Events from several calendars, fetched concurrently on the bounded calendar_fetch_executor and merged.
+    Returns (events, errors) where errors maps the calendars that could not be read to the reason.
+    """
+    if len(calendar_ids) == 1:
+        return query_events(creds, start_time, end_time, limit, calendar_ids[0]), {}
+
+    futures = {
+        calendar_id: calendar_fetch_executor.submit(query_events, creds, start_time, end_time, limit, calendar_id)
+        for calendar_id in calendar_ids
+    }
+
+    streams = {}
+    errors = {}
+    for calendar_id, future in futures.items():
+        try:
+            streams[calendar_id] = future.result()
+        except Exception as error:
+            # Timeouts and transport errors too: one unreachable calendar shouldn't lose the others' events
+            errors[calendar_id] = f"An error occurred: {error}"
+
+    return merge_calendar_events(streams, limit), errors
+
+def mirror_created_event(calendar_id: str, event: dict) -> None:
+    if not USE_EVENT_MIRROR:
+        return
+    try:
+        if calendar_id == DEFAULT_CALENDAR_ID:
+            event_mirror.write_event(event)
+        else:
+            # The calendar may be the primary one under its own ID; the next query re-syncs
+            event_mirror.mark_stale()
+    except sqlite3.Error:
+        # The event was created; the mirror catches up with the next sync
+        event_mirror.mark_stale()
+
+def mirror_deleted_event(calendar_id: str, event_id: str) -> None:
+    if not USE_EVENT_MIRROR:
+        return
+    try:
+        if calendar_id == DEFAULT_CALENDAR_ID:
+            event_mirror.delete_event(event_id)
+        else:
+            event_mirror.mark_stale()
+    except sqlite3.Error:
+        event_mirror.mark_stale()
+
+def nearest_free_starts(busy: IntervalIndex, periods: list, start: float, duration: float, not_before: float, count: int) -> list:
+    """Start times of up to count free slots of the given duration within periods, nearest to start first. One per gap."""
+    candidates = []
+    for period_start, period_end in periods:
+        for gap_start, gap_end in busy.gaps(period_start, period_end):
+            earliest = max(gap_start, not_before)
+            latest = gap_end - duration
+            if earliest <= latest:
+                candidates.append(min(max(start, earliest), latest))
+
+    candidates.sort(key=lambda candidate: abs(candidate - start))
+    return candidates[:count]
+
+def find_conflicts(creds, start_time: str, end_time: str, calendar_id: str = DEFAULT_CALENDAR_ID):
+    """
+    Events blocking [start_time, end_time) on a calendar, checked against an IntervalIndex of the
+    CONFLICT_SEARCH_HOURS either side, along with the nearest free slots of the same length in that window.
+    Alternatives keep to working hours unless the proposed time is outside them. Returns None when the time is free.
+    """
+    start = datetime.datetime.fromisoformat(start_time)
+    end = datetime.datetime.fromisoformat(end_time)
+    window_start = start - datetime.timedelta(hours=CONFLICT_SEARCH_HOURS)
+    window_end = end + datetime.timedelta(hours=CONFLICT_SEARCH_HOURS)
+
+    events = query_events(creds, to_calendar_time(window_start), to_calendar_time(window_end), EVENTS_HARD_CAP, calendar_id)
+    blocking = [event for event in events if event.get("transparency") != "transparent" and event.get("status") != "cancelled"]
+    busy = IntervalIndex(busy_intervals_from_events(blocking))
+    if not busy.overlapping(start.timestamp(), end.timestamp()):
+        return None
+
+    conflicts = [
+        event for event in blocking
+        if event_time_to_timestamp(event["start"]) < end.timestamp() and event_time_to_timestamp(event["end"]) > start.timestamp()
+    ]
+
+    in_working_hours = working_periods(start, end, DEFAULT_WORKING_HOURS) == [(start.timestamp(), end.timestamp())]
+    periods = working_periods(window_start, window_end, DEFAULT_WORKING_HOURS if in_working_hours else None)
+    duration = end.timestamp() - start.timestamp()
+    starts = nearest_free_starts(busy, periods, start.timestamp(), duration, datetime.datetime.now().timestamp(), MAX_ALTERNATIVE_SLOTS)
+
+    return {
+        "conflicts": compact_events(conflicts, "minimal"),
+        "alternatives": [format_slot(slot_start, slot_start + duration) for slot_start in starts],
+    }
+
+def conflict_error(conflict: dict) -> dict:
+    """Error result for an event that was not booked because it clashes, carrying find_conflicts' conflicts and alternatives."""
+    count = len(conflict["conflicts"])
+    return {
+        "status": "error",
+        "message": f"Not scheduled: the time overlaps {count} existing event{'s' if count != 1 else ''}. "
+                   "Offer the user one of the alternatives, or schedule again with allow_conflicts set to true to book it anyway.",
+        **conflict,
+    }
+
+def get_calendars() -> dict:
+    """Lists the user's calendars: their own, shared, team, holiday and resource calendars.
+
+    Returns:
+        dict: status and calendars, each with an id (to pass to get_events as calendar_ids, or to schedule or cancel events on),
+        name, whether it is the primary calendar, and access_role ('owner' or 'writer' calendars can be scheduled on).
+    """
+    try:
+        creds = get_creds()
+    except Exception as e:
+        return {"status": "error", "message": f"Cannot get credentials: {e}"}
+
+    try:
+        return {"status": "success", "calendars": list_calendars(creds)}
+    except HttpError as error:
+        return {"status": "error", "message": f"An error occurred: {error}"}
+
+def get_events(start_time=None, end_time=None, max_results: int = None, verbosity: str = None, calendar_ids: list[str] = None) -> dict:
     """Gets the upcoming events in the calendar
     Args:
-        max_results (int) - optional: the max number of events to fetch. 
+        calendar_ids (list of str) - optional: IDs of the calendars to read (from get_calendars), or ['all'] for every calendar. Defaults to the primary calendar.
+        Events from several calendars come back as one list in start time order, each tagged with the calendars it is on.
+        max_results (int) - optional: the max number of events to fetch. Defaults to every event in the window (up to 500).
+        verbosity (str) - optional: 'minimal' (id, title, start, end), 'standard' (+ location, all_day, attendee_count) or 'detailed' (+ description, attendees, status). Defaults to 'standard'.
         start_time - optional: the starting bounds for events to fetch. 
         end_time - optional: the ending bounds for events to fetch. 
         Defaults from current time to 1 week from the current time. 
@@ -29,56 +383,104 @@ def get_events(start_time=None, end_time=None, max_results: int = 10) -> dict:
         return {"status": "error", "events": f"Cannot get credentials: {e}"}
 
     try:
-        service = build("calendar", "v3", credentials=creds)
+        start_dt, end_dt, start_time, end_time = resolve_query_window(start_time, end_time)
 
-        # Determine start_time
-        if start_time is None:
-            current_dt = get_current_date_and_time()
-            start_dt = current_dt["timestamp"]
-            start_time = format_time_to_calendar(current_dt["time_iso"])
-        else:
-            start_dt = start_time if isinstance(start_time, datetime.datetime) else dateparser.parse(start_time)
-            start_time = format_time_to_calendar(start_dt.isoformat())
-
-        # Determine end_time
-        if end_time is None:
-            one_week_later = get_relative_date_and_time(start_dt, "P1W")
-            end_dt = one_week_later["timestamp"]
-            end_time = format_time_to_calendar(one_week_later["time_iso"])
-        else:
-            end_dt = end_time if isinstance(end_time, datetime.datetime) else dateparser.parse(end_time)
-            end_time = format_time_to_calendar(end_dt.isoformat())
-
-        params = {
-            "calendarId": "primary",
-            "timeMin": start_time,
-            "timeMax": end_time,
-            "maxResults": max_results,
-            "singleEvents": True,
-            "orderBy": "startTime",
-        }
+        limit = min(max_results, EVENTS_HARD_CAP) if max_results else EVENTS_HARD_CAP
+
+        calendar_ids = resolve_calendar_ids(creds, calendar_ids)
+
+        # Fetch one extra event to tell whether the window was cut off
+        events, calendar_errors = query_calendars(creds, calendar_ids, start_time, end_time, limit=limit + 1)
+        if calendar_errors and len(calendar_errors) == len(calendar_ids):
+            return {"status": "error", "message": "Could not read any of the calendars.", "calendar_errors": calendar_errors}
 
-        events_result = service.events().list(**params).execute()
-        events = events_result.get("items", [])
+        truncated = len(events) > limit
+        events = events[:limit]
 
         if not events:
-            return {
+            result = {
                 "status": "success",
                 "message": "No upcoming events found.",
                 "start_date": start_dt.strftime("%A %d %B %Y"),
                 "end_date": end_dt.strftime("%A %d %B %Y"),
             }
+        else:
+            result = {
+                "status": "success",
+                "events": compact_events(events, verbosity),
+                "start_date": start_dt.strftime("%A %d %B %Y"),
+                "end_date": end_dt.strftime("%A %d %B %Y"),
+            }
 
-        return {
-            "status": "success",
-            "events": events,
-            "start_date": start_dt.strftime("%A %d %B %Y"),
-            "end_date": end_dt.strftime("%A %d %B %Y"),
-        }
+        if truncated:
+            result["message"] = f"Only the first {limit} events in this window are shown. Narrow the time window to see the rest."
+        if calendar_errors:
+            result["calendar_errors"] = calendar_errors
+
+        return result
 
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
     except HttpError as error:
         return {"status": "error", "events": f"An error occurred: {error}"}
 
+def format_new_event(params: dict) -> dict:
+    """Build a Calendar API event body from schedule_new_event params, or return an error dict."""
+
+    required_keys = ['event_title', 'start_datetime']
+    missing_keys = [key for key in required_keys if key not in params]
+    if missing_keys:
+        return {"status": "error", "message": f"Missing required parameters: {', '.join(missing_keys)}"}
+
+    start_time = format_time_to_calendar(params['start_datetime'])
+    if start_time is None:
+        return {"status": "error", "message": f"Could not parse start_datetime: {params['start_datetime']}"}
+
+    end_time = format_time_to_calendar(params.get('end_datetime')) if params.get('end_datetime') else get_relative_date_and_time(params['start_datetime'], "+ 1 hour").get("time_google_calendar")
+    if end_time is None:
+        return {"status": "error", "message": f"Could not parse end_datetime: {params.get('end_datetime')}"}
+
+    event_title = params.get('event_title').title()
+    timezone = get_local_timezone()
+    description = params.get('description') or ''
+
+    attendees = params.get("attendees")
+
+    attendee_email_addresses = []
+    attendee_names = []
+
+    if attendees is not None:
+
+        for attendee in attendees:
+
+            if is_email_address(attendee):
+                attendee_email_addresses.append({'email': attendee})
+
+            attendee_names.append(attendee)
+
+        if len(attendee_names) > 0:
+            description += "With"
+            description += " " + ", ".join(attendee_names)
+
+    formatted_event = {
+        'summary': event_title,
+        'location': params.get('location'),
+        'description': description,
+        'start': {
+            'dateTime': start_time,
+            'timeZone': timezone,
+        },
+        'end': {
+            'dateTime': end_time,
+            'timeZone': timezone,
+        },
+        'recurrence': params.get('recurrence', []),
+        'attendees': attendee_email_addresses,
+        'reminders': params.get('reminders', {'useDefault': True, 'overrides': []}),
+    }
+
+    return formatted_event
+
 def schedule_new_event(params: dict) -> dict:
     
     """
@@ -97,9 +499,13 @@ def schedule_new_event(params: dict) -> dict:
                 - recurrence (list of str)
                 - attendees (list of str)
                 - reminders (dict)
+                - calendar_id (str): calendar to add the event to (from get_calendars). Defaults to the primary calendar.
+                - allow_conflicts (bool): book the event even if it overlaps existing events. Defaults to false.
     
     Returns:
         dict: Response from Google Calendar API or error info.
+        If the time overlaps existing events nothing is booked: the error lists the conflicts and up to 3 alternatives,
+        the nearest free slots of the same length (start, end).
     """
 
 
@@ -111,59 +517,8 @@ def schedule_new_event(params: dict) -> dict:
 
 
 
-    def format_new_event(params: dict) -> dict:
-
-        required_keys = ['event_title', 'start_datetime']
-        missing_keys = [key for key in required_keys if key not in params]
-        if missing_keys:
-            return {"status": "error", "message": f"Missing required parameters: {', '.join(missing_keys)}"}
-
-        start_time = format_time_to_calendar(params['start_datetime'])
-        if start_time is None:
-            return {"status": "error", "message": f"Could not parse start_datetime: {params['start_datetime']}"}
-
-        end_time = format_time_to_calendar(params.get('end_datetime')) if params.get('end_datetime') else get_relative_date_and_time(params['start_datetime'], "+ 1 hour").get("time_google_calendar")
-        event_title = params.get('event_title').title()
-        timezone = get_local_timezone()
-        description = params.get('description') or ''
-
-        attendees = params.get("attendees")
-
-        attendee_email_addresses = []
-        attendee_names = []
-
-        if attendees is not None:
-
-            for attendee in attendees:
-
-                if is_email_address(attendee):
-                    attendee_email_addresses.append({'email': attendee})
-
-                attendee_names.append(attendee)
-
-            if len(attendee_names) > 0:
-                description += "With"
-                description += " " + ", ".join(attendee_names)
-
-        formatted_event = {
-            'summary': event_title,
-            'location': params.get('location'),
-            'description': description,
-            'start': {
-                'dateTime': start_time,
-                'timeZone': timezone,
-            },
-            'end': {
-                'dateTime': end_time,
-                'timeZone': timezone,
-            },
-            'recurrence': params.get('recurrence', []),
-            'attendees': attendee_email_addresses,
-            'reminders': params.get('reminders', {'useDefault': True, 'overrides': []}),
-        }
-
-        return formatted_event
-
+    calendar_id = params.get("calendar_id") or DEFAULT_CALENDAR_ID
+    allow_conflicts = str(params.get("allow_conflicts")).lower() == "true"
 
     def add_event_to_calendar(event: dict) -> dict:
         try:
@@ -172,21 +527,34 @@ def schedule_new_event(params: dict) -> dict:
             return {"status": "error", "message": f"Cannot get credentials: {e}"}
 
         try:
-            service = build("calendar", "v3", credentials=creds)
-            created_event = service.events().insert(calendarId='primary', body=event).execute()
-            return {"status": "success", "event": created_event}
+            if not allow_conflicts:
+                try:
+                    conflict = find_conflicts(creds, event["start"]["dateTime"], event["end"]["dateTime"], calendar_id)
+                except Exception as error:
+                    return {"status": "error", "message": f"Could not check for conflicting events, so nothing was booked: {error}"}
+                if conflict:
+                    return conflict_error(conflict)
+
+            with calendar_service(creds) as service:
+                created_event = service.events().insert(calendarId=calendar_id, body=event).execute()
+            mirror_created_event(calendar_id, created_event)
+            return {"status": "success", "event": compact_event(created_event)}
         except HttpError as error:
             return {"status": "error", "message": f"An error occurred: {error}"}
     
     formatted_event = format_new_event(params)
+    if formatted_event.get("status") == "error":
+        return formatted_event
+
     return add_event_to_calendar(formatted_event)
 
-def cancel_event(event_id: str) -> dict:
+def cancel_event(event_id: str, calendar_id: str = DEFAULT_CALENDAR_ID) -> dict:
     """
-    Cancel (delete) an event from the user's primary Google Calendar.
+    Cancel (delete) an event from the user's Google Calendar.
 
     Args:
         event_id (str): The unique Google Calendar event ID.
+        calendar_id (str) - optional: the calendar the event is on (from get_events). Defaults to the primary calendar.
 
     Returns:
         dict: Status and message about the deletion.
@@ -199,12 +567,12 @@ def cancel_event(event_id: str) -> dict:
     except Exception as e:
         return {"status": "error", "message": f"Cannot get credentials: {e}"}
     try:
-        service = build("calendar", "v3", credentials=creds)
-
-        service.events().delete(
-            calendarId="primary",
-            eventId=event_id
-        ).execute()
+        with calendar_service(creds) as service:
+            service.events().delete(
+                calendarId=calendar_id,
+                eventId=event_id
+            ).execute()
+        mirror_deleted_event(calendar_id, event_id)
 
         return {
             "status": "success",
@@ -223,6 +591,179 @@ def cancel_event(event_id: str) -> dict:
             "message": f"Unexpected error: {e}"
         }
 
+def execute_batched(creds, operations: list) -> list:
+    """
+    Run Calendar API operations as batch HTTP requests, CALENDAR_BATCH_LIMIT per round-trip.
+    Each operation takes a service and returns an unexecuted request.
+    Returns a (response, exception) pair per operation, in order.
+    """
+    results = [(None, None)] * len(operations)
+
+    def callback(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    with calendar_service(creds) as service:
+        for offset in range(0, len(operations), CALENDAR_BATCH_LIMIT):
+            batch = service.new_batch_http_request(callback=callback)
+            for index in range(offset, min(offset + CALENDAR_BATCH_LIMIT, len(operations))):
+                batch.add(operations[index](service), request_id=str(index))
+
+            try:
+                batch.execute()
+            except Exception as error:
+                # The whole batch failed (HTTP or transport error), so every operation in it without a response did too.
+                # Later batches still run: earlier ones are already committed and need their results reported.
+                for index in range(offset, min(offset + CALENDAR_BATCH_LIMIT, len(operations))):
+                    if results[index] == (None, None):
+                        results[index] = (None, error)
+
+    return results
+
+def schedule_new_events(events: list[dict]) -> dict:
+    """
+    Description: schedule several events in the Google Calendar in one go.
+
+    Args:
+        events (list of dict): One dict per event, with the same keys as schedule_new_event params
+            (event_title, start_datetime and end_datetime required, calendar_id and allow_conflicts optional).
+
+    Returns:
+        dict: status, counts, and one result per event (in the same order) with either the created event or an error message.
+        Like schedule_new_event, an event that overlaps existing events (or an earlier event in the same call) is not booked
+        unless its allow_conflicts is true; its error lists the conflicts and any alternatives.
+    """
+    if not events:
+        return {"status": "error", "message": "No events provided"}
+
+    results = [None] * len(events)
+    formatted_events = {}
+
+    for index, params in enumerate(events):
+        if not isinstance(params, dict) or params.get("end_datetime") is None:
+            results[index] = {"index": index, "status": "error", "message": "Missing required end_datetime key. Set the end_datetime to an hour after the start datetime. "}
+            continue
+
+        formatted_event = format_new_event(params)
+        if formatted_event.get("status") == "error":
+            results[index] = dict(formatted_event, index=index)
+            continue
+
+        formatted_events[index] = formatted_event
+
+    if formatted_events:
+        try:
+            creds = get_creds()
+        except Exception as e:
+            return {"status": "error", "message": f"Cannot get credentials: {e}"}
+
+        # Check every event for clashes at once, on the same bounded pool as multi-calendar reads
+        checks = {
+            index: calendar_fetch_executor.submit(
+                find_conflicts, creds, event["start"]["dateTime"], event["end"]["dateTime"], events[index].get("calendar_id") or DEFAULT_CALENDAR_ID
+            )
+            for index, event in formatted_events.items()
+            if str(events[index].get("allow_conflicts")).lower() != "true"
+        }
+
+        operations = []
+        operation_indexes = []
+        booked = []
+        for index, event in formatted_events.items():
+            calendar_id = events[index].get("calendar_id") or DEFAULT_CALENDAR_ID
+
+            # A check that fails (HTTP error, timeout, bad time) only fails its own event
+            try:
+                start = datetime.datetime.fromisoformat(event["start"]["dateTime"]).timestamp()
+                end = datetime.datetime.fromisoformat(event["end"]["dateTime"]).timestamp()
+                conflict = checks[index].result() if index in checks else None
+            except Exception as error:
+                results[index] = {"index": index, "status": "error", "message": f"Could not check for conflicting events, so nothing was booked: {error}"}
+                continue
+            if conflict:
+                results[index] = dict(conflict_error(conflict), index=index)
+                continue
+
+            if index in checks:
+                # Events earlier in this call aren't in the calendar yet, so find_conflicts can't see them
+                clashes = [other for other, other_calendar, other_start, other_end in booked
+                           if other_calendar == calendar_id and other_start < end and other_end > start]
+                if clashes:
+                    results[index] = {
+                        "index": index,
+                        "status": "error",
+                        "message": f"Not scheduled: the time overlaps event {', '.join(map(str, clashes))} in this call. "
+                                   "Move one of them, or schedule again with allow_conflicts set to true to book both.",
+                    }
+                    continue
+
+            booked.append((index, calendar_id, start, end))
+            operations.append(lambda service, body=event, calendar_id=calendar_id: service.events().insert(calendarId=calendar_id, body=body))
+            operation_indexes.append(index)
+
+        for index, (created_event, error) in zip(operation_indexes, execute_batched(creds, operations)):
+            if error is not None:
+                results[index] = {"index": index, "status": "error", "message": f"An error occurred: {error}"}
+            else:
+                mirror_created_event(events[index].get("calendar_id") or DEFAULT_CALENDAR_ID, created_event)
+                results[index] = {"index": index, "status": "success", "event": compact_event(created_event)}
+
+    return batch_summary(results)
+
+def cancel_events(event_ids: list[str], calendar_id: str = DEFAULT_CALENDAR_ID) -> dict:
+    """
+    Cancel (delete) several events from one of the user's Google Calendars in one go.
+
+    Args:
+        event_ids (list of str): The unique Google Calendar event IDs.
+        calendar_id (str) - optional: the calendar the events are on (from get_events). Defaults to the primary calendar.
+
+    Returns:
+        dict: status, counts, and one result per event ID (in the same order).
+    """
+    if not event_ids:
+        return {"status": "error", "message": "Missing required parameter: event_ids"}
+
+    try:
+        creds = get_creds()
+    except Exception as e:
+        return {"status": "error", "message": f"Cannot get credentials: {e}"}
+
+    results = [None] * len(event_ids)
+    operations = []
+    operation_indexes = []
+
+    for index, event_id in enumerate(event_ids):
+        if not event_id:
+            results[index] = {"index": index, "status": "error", "message": "Missing event_id"}
+            continue
+        operations.append(lambda service, event_id=event_id: service.events().delete(calendarId=calendar_id, eventId=event_id))
+        operation_indexes.append(index)
+
+    for index, (_, error) in zip(operation_indexes, execute_batched(creds, operations)):
+        event_id = event_ids[index]
+        if error is not None:
+            results[index] = {"index": index, "event_id": event_id, "status": "error", "message": f"Failed to cancel event: {error}"}
+        else:
+            mirror_deleted_event(calendar_id, event_id)
+            results[index] = {"index": index, "event_id": event_id, "status": "success", "message": f"Event '{event_id}' has been cancelled successfully."}
+
+    return batch_summary(results)
+
+def batch_summary(results: list) -> dict:
+    """Overall result for a batch. The status is only "error" when every item failed."""
+    failed = sum(1 for result in results if result["status"] == "error")
+    summary = {
+        "status": "error" if failed == len(results) else "success",
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+
+    if 0 < failed < len(results):
+        summary["message"] = f"{failed} of {len(results)} items failed. See results for details."
+
+    return summary
+
 def is_email_address(x: str) -> bool:
     if not x or not isinstance(x, str):
         return False
@@ -0,0 +1,96 @@
+import os
+import json
+import datetime
+
+# How much of each event calendar tools send back to the model
+VERBOSITY_LEVELS = ("minimal", "standard", "detailed", "raw")
+DEFAULT_EVENT_VERBOSITY = os.getenv("EVENT_VERBOSITY", "standard")
+
+# Rough average for English/JSON text, good enough to compare payload sizes
+BYTES_PER_TOKEN = 4
+
+
+def event_time(value: dict) -> str:
+    if isinstance(value, dict):
+        return value.get("dateTime") or value.get("date")
+    return value
+
+
+def parse_event_time(value) -> tuple:
+    """
+    (timestamp, all_day) for an event start/end: a Calendar API {'dateTime': ...} / {'date': ...} dict,
+    or a plain ISO string. Dates without a time are all-day and start at local midnight.
+    """
+    if isinstance(value, dict):
+        if value.get("dateTime"):
+            return datetime.datetime.fromisoformat(value["dateTime"]).timestamp(), False
+        value = value["date"]
+
+    parsed = datetime.datetime.fromisoformat(value)
+    all_day = len(value) <= 10
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()
+    return parsed.timestamp(), all_day
+
+
+def compact_event(event: dict, verbosity: str = None) -> dict:
+    """
+    Project a Calendar API event resource down to what the model needs.
+        minimal:  id, title, start, end, calendars (when read from several calendars)
+        standard: + location, all_day, attendee_count (default)
+        detailed: + description, attendees, status, recurring_event_id
+        raw:      the event resource unchanged
+    Empty fields are left out.
+    """
+    verbosity = verbosity or DEFAULT_EVENT_VERBOSITY
+    if verbosity not in VERBOSITY_LEVELS:
+        raise ValueError(f"verbosity must be one of {', '.join(VERBOSITY_LEVELS)}, got: {verbosity}")
+
+    if verbosity == "raw":
+        return event
+
+    start = event.get("start") or {}
+    compact = {
+        "id": event.get("id"),
+        "title": event.get("summary"),
+        "start": event_time(start),
+        "end": event_time(event.get("end") or {}),
+        "calendars": event.get("calendars"),
+    }
+
+    if verbosity in ("standard", "detailed"):
+        compact["location"] = event.get("location")
+        compact["all_day"] = isinstance(start, dict) and "date" in start and "dateTime" not in start
+        compact["attendee_count"] = len(event.get("attendees") or [])
+
+    if verbosity == "detailed":
+        compact["description"] = event.get("description")
+        compact["attendees"] = [attendee.get("email") for attendee in event.get("attendees") or []]
+        compact["status"] = event.get("status")
+        compact["recurring_event_id"] = event.get("recurringEventId")
+
+    return {key: value for key, value in compact.items() if value not in (None, "", [])}
+
+
+def compact_events(events: list, verbosity: str = None) -> list:
+    return [compact_event(event, verbosity) for event in events]
+
+
+def payload_size(payload) -> dict:
+    """Serialized size of a tool payload in bytes, with an approximate token count."""
+    size = len(json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8"))
+    return {"bytes": size, "approx_tokens": -(-size // BYTES_PER_TOKEN)}
+
+
+def measure_projection_savings(events: list, verbosity: str = None) -> dict:
+    """Bytes and approximate tokens saved by sending compact events instead of the raw resources."""
+    raw = payload_size(events)
+    compact = payload_size(compact_events(events, verbosity))
+    return {
+        "verbosity": verbosity or DEFAULT_EVENT_VERBOSITY,
+        "raw": raw,
+        "compact": compact,
+        "bytes_saved": raw["bytes"] - compact["bytes"],
+        "approx_tokens_saved": raw["approx_tokens"] - compact["approx_tokens"],
+        "reduction": round(1 - compact["bytes"] / raw["bytes"], 3) if raw["bytes"] else 0.0,
+    }
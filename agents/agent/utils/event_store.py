@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import datetime
+import threading
+from pathlib import Path
+
+from googleapiclient.errors import HttpError
+
+from .calendar_service import calendar_service, credential_key
+
+CURRENT_DIRECTORY = Path(__file__).resolve().parent
+
+EVENT_MIRROR_PATH = Path(os.getenv("EVENT_MIRROR_PATH", CURRENT_DIRECTORY / "../../../setup/event_mirror.db"))
+
+# How old the mirror may get before a query triggers an incremental sync
+MIRROR_MAX_AGE_SECONDS = 60
+SYNC_PAGE_SIZE = 2500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_start_ts ON events (start_ts);
+CREATE INDEX IF NOT EXISTS events_end_ts ON events (end_ts);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def event_time_to_timestamp(event_time: dict) -> float:
+    """Convert an event's start/end ({'dateTime': ...} or all-day {'date': ...}) to a POSIX timestamp."""
+    if event_time.get("dateTime"):
+        return datetime.datetime.fromisoformat(event_time["dateTime"]).timestamp()
+
+    # All-day events start at local midnight
+    return datetime.datetime.fromisoformat(event_time["date"]).astimezone().timestamp()
+
+
+def account_fingerprint(creds) -> str:
+    """
+    Stable ID for the account behind creds. The OAuth client_id alone is shared by every user of the app,
+    so the refresh token is included; it is hashed so no token is written to the mirror.
+    """
+    return hashlib.sha256(repr(credential_key(creds)).encode("utf-8")).hexdigest()
+
+
+class EventMirror:
+    """
+    Local SQLite (WAL mode) copy of one calendar, kept current with incremental syncToken syncs.
+    Window queries are answered from the start/end index; only stale mirrors hit the API.
+    """
+
+    def __init__(self, path: Path, calendar_id: str = "primary", fields: str = None,
+                 max_age: float = MIRROR_MAX_AGE_SECONDS):
+        self.path = path
+        self.calendar_id = calendar_id
+        self.fields = fields
+        self.max_age = max_age
+        self._conn = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._synced_at = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _get_meta(self, key: str):
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def query(self, creds, time_min: datetime.datetime, time_max: datetime.datetime, limit: int = None) -> list:
+        """Return events overlapping [time_min, time_max) in start time order, syncing first if the mirror is stale."""
+        self.sync(creds)
+
+        sql = "SELECT body FROM events WHERE start_ts < ? AND end_ts > ? ORDER BY start_ts, id"
+        args = [time_max.timestamp(), time_min.timestamp()]
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+
+        with self._lock:
+            rows = self._connection().execute(sql, args).fetchall()
+        return [json.loads(body) for (body,) in rows]
+
+    def sync(self, creds, force: bool = False) -> None:
+        """Bring the mirror up to date: a full sync the first time, then syncToken deltas."""
+        if not force and time.monotonic() - self._synced_at < self.max_age:
+            return
+
+        with self._sync_lock:
+            # Another caller may have synced while we waited
+            if not force and time.monotonic() - self._synced_at < self.max_age:
+                return
+
+            account = account_fingerprint(creds)
+            with self._lock:
+                # A different account, or different event fields than the stored copies were fetched with, needs a full sync
+                if self._get_meta("account") != account or self._get_meta("fields") != (self.fields or ""):
+                    self._reset(account)
+                sync_token = self._get_meta("sync_token")
+
+            try:
+                self._pull(creds, sync_token)
+            except HttpError as error:
+                # 410 Gone: the sync token expired, start over with a full sync
+                if error.resp.status != 410:
+                    raise
+                with self._lock:
+                    self._reset(account)
+                self._pull(creds, None)
+
+            self._synced_at = time.monotonic()
+
+    def _pull(self, creds, sync_token) -> None:
+        params = {
+            "calendarId": self.calendar_id,
+            "maxResults": SYNC_PAGE_SIZE,
+            "singleEvents": True,
+        }
+        if self.fields:
+            params["fields"] = f"nextPageToken,nextSyncToken,items({self.fields})"
+        if sync_token:
+            params["syncToken"] = sync_token
+
+        with calendar_service(creds) as service:
+            while True:
+                page = service.events().list(**params).execute()
+                self._apply(page.get("items", []), page.get("nextSyncToken"))
+
+                page_token = page.get("nextPageToken")
+                if not page_token:
+                    return
+                params["pageToken"] = page_token
+
+    def _apply(self, events: list, sync_token: str = None) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                for event in events:
+                    if event.get("status") == "cancelled":
+                        conn.execute("DELETE FROM events WHERE id = ?", (event["id"],))
+                    else:
+                        self._upsert(conn, event)
+                if sync_token:
+                    self._set_meta(conn, "sync_token", sync_token)
+
+    def _upsert(self, conn: sqlite3.Connection, event: dict) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO events (id, start_ts, end_ts, body) VALUES (?, ?, ?, ?)",
+            (
+                event["id"],
+                event_time_to_timestamp(event["start"]),
+                event_time_to_timestamp(event["end"]),
+                json.dumps(event),
+            ),
+        )
+
+    def _reset(self, account: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM events")
+            conn.execute("DELETE FROM meta")
+            self._set_meta(conn, "account", account)
+            self._set_meta(conn, "fields", self.fields or "")
+        self._synced_at = 0.0
+
+    def write_event(self, event: dict) -> None:
+        """Write a newly created event through to the mirror."""
+        if event.get("recurrence"):
+            # Recurring masters are expanded into instances by the next sync
+            self.mark_stale()
+            return
+        self._apply([event])
+
+    def delete_event(self, event_id: str) -> None:
+        """Remove a cancelled event from the mirror."""
+        self._apply([{"id": event_id, "status": "cancelled"}])
+        # If it was a recurring master, its stored instances go with the next sync
+        self.mark_stale()
+
+    def mark_stale(self) -> None:
+        self._synced_at = 0.0
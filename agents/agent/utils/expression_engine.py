@@ -0,0 +1,134 @@
+import ast
+import math
+import operator
+from functools import lru_cache
+
+# Functions and constants expressions may use: everything public in the math module
+MATH_NAMES = {name: value for name, value in vars(math).items() if not name.startswith("_")}
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+# Keep '9 ** 9 ** 9', '(10 ** 10000) ** 10000' or 'factorial(10 ** 7)' from tying up the process
+MAX_EXPONENT = 10000
+MAX_RESULT_BITS = 100000
+MAX_FACTORIAL = 1000
+
+COMPILED_EXPRESSION_CACHE_SIZE = 512
+
+
+def safe_pow(base, exponent):
+    if isinstance(exponent, (int, float)) and abs(exponent) > MAX_EXPONENT:
+        raise ValueError(f"Exponent too large: {exponent}")
+    # Integer powers are exact, so their size is only bounded by memory: estimate it before computing
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        if exponent * math.log2(abs(base)) > MAX_RESULT_BITS:
+            raise ValueError("Result too large")
+    return operator.pow(base, exponent)
+
+
+def safe_factorial(x):
+    if x > MAX_FACTORIAL:
+        raise ValueError(f"factorial argument too large: {x}")
+    return math.factorial(x)
+
+
+def safe_comb(n, k):
+    if n > MAX_FACTORIAL:
+        raise ValueError(f"comb argument too large: {n}")
+    return math.comb(n, k)
+
+
+def safe_perm(n, k=None):
+    if n > MAX_FACTORIAL:
+        raise ValueError(f"perm argument too large: {n}")
+    return math.perm(n, k)
+
+
+# Math functions whose result grows too fast to call on arbitrary arguments
+GUARDED_FUNCTIONS = {
+    "factorial": safe_factorial,
+    "comb": safe_comb,
+    "perm": safe_perm,
+}
+
+
+def compile_node(node: ast.AST):
+    """Turn a whitelisted AST node into a closure taking a dict of variables. Anything else is rejected."""
+    if isinstance(node, ast.Expression):
+        return compile_node(node.body)
+
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Only numbers are allowed, got: {node.value!r}")
+        value = node.value
+        return lambda variables: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in MATH_NAMES:
+            value = MATH_NAMES[name]
+            return lambda variables: value
+
+        def lookup(variables):
+            try:
+                value = variables[name]
+            except KeyError:
+                raise ValueError(f"Unknown name: {name}")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Variable {name} must be a number, got: {value!r}")
+            return value
+        return lookup
+
+    if isinstance(node, ast.BinOp):
+        left = compile_node(node.left)
+        right = compile_node(node.right)
+        if isinstance(node.op, ast.Pow):
+            return lambda variables: safe_pow(left(variables), right(variables))
+        if type(node.op) not in BINARY_OPERATORS:
+            raise ValueError(f"Operator not allowed: {type(node.op).__name__}")
+        op = BINARY_OPERATORS[type(node.op)]
+        return lambda variables: op(left(variables), right(variables))
+
+    if isinstance(node, ast.UnaryOp):
+        if type(node.op) not in UNARY_OPERATORS:
+            raise ValueError(f"Operator not allowed: {type(node.op).__name__}")
+        op = UNARY_OPERATORS[type(node.op)]
+        operand = compile_node(node.operand)
+        return lambda variables: op(operand(variables))
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or not callable(MATH_NAMES.get(node.func.id)):
+            raise ValueError(f"Only math functions may be called, got: {ast.unparse(node.func)}")
+        if node.keywords:
+            raise ValueError("Keyword arguments are not allowed")
+        function = GUARDED_FUNCTIONS.get(node.func.id, MATH_NAMES[node.func.id])
+        arguments = [compile_node(argument) for argument in node.args]
+        return lambda variables: function(*(argument(variables) for argument in arguments))
+
+    raise ValueError(f"Expression element not allowed: {type(node).__name__}")
+
+
+@lru_cache(maxsize=COMPILED_EXPRESSION_CACHE_SIZE)
+def compile_expression(expression: str):
+    """Parse and compile an arithmetic expression once; repeated expressions come from the LRU cache."""
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {expression} ({e.msg})")
+    return compile_node(tree)
+
+
+def evaluate(expression: str, variables: dict = None) -> float:
+    return float(compile_expression(expression)(variables or {}))
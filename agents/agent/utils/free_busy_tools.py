@@ -0,0 +1,119 @@
+import datetime
+
+from googleapiclient.errors import HttpError
+
+from .handle_credentials import get_creds
+from .calendar_service import calendar_service
+from .calendar_tools import USE_EVENT_MIRROR, query_events, resolve_query_window
+from .intervals import DEFAULT_WORKING_HOURS, IntervalIndex, busy_intervals_from_events, format_slot, working_periods
+
+
+def get_busy_index(creds, start_time: str, end_time: str, calendar_id: str = "primary") -> IntervalIndex:
+    """Busy time in a window, from the local event mirror when enabled, otherwise from freebusy.query."""
+    if USE_EVENT_MIRROR:
+        return IntervalIndex(busy_intervals_from_events(query_events(creds, start_time, end_time)))
+
+    body = {"timeMin": start_time, "timeMax": end_time, "items": [{"id": calendar_id}]}
+    with calendar_service(creds) as service:
+        response = service.freebusy().query(body=body).execute()
+
+    busy = response.get("calendars", {}).get(calendar_id, {}).get("busy", [])
+    return IntervalIndex(
+        (datetime.datetime.fromisoformat(period["start"]).timestamp(), datetime.datetime.fromisoformat(period["end"]).timestamp())
+        for period in busy
+    )
+
+
+def find_free_slots(start_time=None, end_time=None, min_duration_minutes: int = 30,
+                    working_hours: str = DEFAULT_WORKING_HOURS) -> dict:
+    """
+    Find free slots in the calendar.
+    Args:
+        start_time - optional: start of the window to search. Defaults to now.
+        end_time - optional: end of the window to search. Defaults to 1 week after start_time.
+        min_duration_minutes (int) - optional: shortest slot worth returning. Defaults to 30.
+        working_hours (str) - optional: daily hours to search within, e.g. '09:00-17:00'. Pass an empty string to search the whole day.
+
+    Returns:
+        dict: status, the free slots (start, end, duration_hours) in time order, and total free hours.
+    """
+    try:
+        creds = get_creds()
+    except Exception as e:
+        return {"status": "error", "message": f"Cannot get credentials: {e}"}
+
+    try:
+        start_dt, end_dt, start_time, end_time = resolve_query_window(start_time, end_time)
+        window_start = datetime.datetime.fromisoformat(start_time)
+        window_end = datetime.datetime.fromisoformat(end_time)
+        periods = working_periods(window_start, window_end, working_hours)
+
+        busy = get_busy_index(creds, start_time, end_time)
+        min_duration = min_duration_minutes * 60
+
+        slots = [
+            (slot_start, slot_end)
+            for period_start, period_end in periods
+            for slot_start, slot_end in busy.gaps(period_start, period_end)
+            if slot_end - slot_start >= min_duration
+        ]
+
+        return {
+            "status": "success",
+            "free_slots": [format_slot(slot_start, slot_end) for slot_start, slot_end in slots],
+            "total_free_hours": round(sum(slot_end - slot_start for slot_start, slot_end in slots) / 3600.0, 2),
+            "start_date": start_dt.strftime("%A %d %B %Y"),
+            "end_date": end_dt.strftime("%A %d %B %Y"),
+        }
+
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    except HttpError as error:
+        return {"status": "error", "message": f"An error occurred: {error}"}
+
+
+def total_free_hours(start_time=None, end_time=None, working_hours: str = "") -> dict:
+    """
+    Total hours with no events scheduled.
+    Args:
+        start_time - optional: start of the window. Defaults to now.
+        end_time - optional: end of the window. Defaults to 1 week after start_time.
+        working_hours (str) - optional: only count free time within these daily hours, e.g. '09:00-17:00'.
+
+    Returns:
+        dict: status, total free hours and total busy hours in the window.
+    """
+    try:
+        creds = get_creds()
+    except Exception as e:
+        return {"status": "error", "message": f"Cannot get credentials: {e}"}
+
+    try:
+        start_dt, end_dt, start_time, end_time = resolve_query_window(start_time, end_time)
+        periods = working_periods(
+            datetime.datetime.fromisoformat(start_time),
+            datetime.datetime.fromisoformat(end_time),
+            working_hours,
+        )
+
+        busy = get_busy_index(creds, start_time, end_time)
+
+        free_seconds = 0.0
+        busy_seconds = 0.0
+        for period_start, period_end in periods:
+            period_free = sum(slot_end - slot_start for slot_start, slot_end in busy.gaps(period_start, period_end))
+            free_seconds += period_free
+            busy_seconds += (period_end - period_start) - period_free
+
+        return {
+            "status": "success",
+            "total_free_hours": round(free_seconds / 3600.0, 2),
+            "total_busy_hours": round(busy_seconds / 3600.0, 2),
+            "start_date": start_dt.strftime("%A %d %B %Y"),
+            "end_date": end_dt.strftime("%A %d %B %Y"),
+        }
+
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    except HttpError as error:
+        return {"status": "error", "message": f"An error occurred: {error}"}
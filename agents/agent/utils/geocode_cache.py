@@ -0,0 +1,92 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+from .cache import TTLCache
+
+CURRENT_DIRECTORY = Path(__file__).resolve().parent
+
+GEOCODE_CACHE_PATH = Path(os.getenv("GEOCODE_CACHE_PATH", CURRENT_DIRECTORY / "../../../setup/geocode_cache.db"))
+
+# Places hardly ever move; places that don't resolve are retried sooner
+GEOCODE_TTL_SECONDS = 30 * 24 * 60 * 60
+GEOCODE_NEGATIVE_TTL_SECONDS = 24 * 60 * 60
+GEOCODE_MEMORY_CACHE_SIZE = 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocodes (
+    place TEXT PRIMARY KEY,
+    result TEXT,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def normalize_place(place: str) -> str:
+    """'  New  York ' and 'new york' share a cache entry."""
+    return " ".join(place.lower().split())
+
+
+class GeocodeCache:
+    """
+    Two-tier geocoding cache: an in-process LRU in front of an on-disk SQLite store.
+    A cached None means the place is known not to resolve (negative caching).
+    """
+
+    def __init__(self, path: Path, ttl: float = GEOCODE_TTL_SECONDS, negative_ttl: float = GEOCODE_NEGATIVE_TTL_SECONDS,
+                 memory_size: int = GEOCODE_MEMORY_CACHE_SIZE):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory = TTLCache(maxsize=memory_size)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, place: str):
+        """Returns (found, coords). coords is None for a cached negative result."""
+        key = normalize_place(place)
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            return True, entry[0]
+
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT result, expires_at FROM geocodes WHERE place = ?", (key,)
+            ).fetchone()
+
+        if row is None or row[1] <= time.time():
+            return False, None
+
+        coords = json.loads(row[0]) if row[0] is not None else None
+        # Wrapped in a tuple so a negative result isn't mistaken for a memory miss
+        self.memory.set(key, (coords,), ttl=row[1] - time.time())
+        return True, coords
+
+    def set(self, place: str, coords) -> None:
+        key = normalize_place(place)
+        ttl = self.ttl if coords is not None else self.negative_ttl
+
+        self.memory.set(key, (coords,), ttl=ttl)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO geocodes (place, result, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(coords) if coords is not None else None, time.time() + ttl),
+                )
+
+    def stats(self) -> dict:
+        return self.memory.stats()
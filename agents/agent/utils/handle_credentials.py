@@ -1,17 +1,103 @@
 import os
+import datetime
+import threading
 from pathlib import Path
 
+from .calendar_service import credential_key, invalidate_calendar_service
+
 USE_SERVICE_ACCOUNT = os.getenv("USE_SERVICE_ACCOUNT", "false").lower() == "true"
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 CURRENT_DIRECTORY = Path(__file__).resolve().parent
 
+# Refresh tokens this long before they expire, so callers never wait on a refresh
+REFRESH_AHEAD = datetime.timedelta(minutes=5)
+
+
+class CredentialManager:
+    """
+    Keeps credentials in memory, re-reading the credentials file only when its mtime changes.
+    Tokens close to expiry are refreshed in a background thread; expired tokens are refreshed
+    once, with concurrent callers waiting on that single refresh.
+    """
+
+    def __init__(self, path: Path, load, refresh):
+        self.path = path
+        self._load = load
+        self._refresh = refresh
+        self._creds = None
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def get(self):
+        creds = self._current_creds()
+
+        if not creds.valid:
+            with self._refresh_lock:
+                # Another caller may have refreshed while we waited
+                if not creds.valid:
+                    self._refresh(creds)
+        elif self._expires_soon(creds) and self._refresh_lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh_in_background, args=(creds,), daemon=True).start()
+
+        return creds
+
+    def reset(self) -> None:
+        with self._lock:
+            if self._creds is not None:
+                invalidate_calendar_service(self._creds)
+            self._creds = None
+            self._mtime = None
+
+    def _current_creds(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Credentials not found at {self.path}")
+
+        with self._lock:
+            if self._creds is None or mtime != self._mtime:
+                previous = self._creds
+                self._creds = self._load(self.path)
+                self._mtime = mtime
+
+                if previous is not None and credential_key(previous) != credential_key(self._creds):
+                    invalidate_calendar_service(previous)
+
+            return self._creds
+
+    def _expires_soon(self, creds) -> bool:
+        if creds.expiry is None:
+            return False
+        # google-auth stores expiry as naive UTC
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return creds.expiry - now < REFRESH_AHEAD
+
+    def _refresh_in_background(self, creds) -> None:
+        try:
+            self._refresh(creds)
+        except Exception:
+            # The next call will retry synchronously once the token has actually expired
+            pass
+        finally:
+            self._refresh_lock.release()
+
+
 if USE_SERVICE_ACCOUNT:
     # ---------------- Service Account Path ----------------
-    from google.oauth2 import service_account
-
     SERVICE_ACCOUNT_PATH = CURRENT_DIRECTORY / "../../../setup/test-credentials.json"
 
+    def _load_service_account(path: Path):
+        from google.oauth2 import service_account
+        return service_account.Credentials.from_service_account_file(path, scopes=SCOPES)
+
+    def _refresh_service_account(creds) -> None:
+        from google.auth.transport.requests import Request
+        creds.refresh(Request())
+
+    credential_manager = CredentialManager(SERVICE_ACCOUNT_PATH, _load_service_account, _refresh_service_account)
+
     def get_creds():
         """
         Returns Google API credentials using a service account.
@@ -20,19 +106,28 @@ if USE_SERVICE_ACCOUNT:
         if not SERVICE_ACCOUNT_PATH.exists():
             raise FileNotFoundError(f"Service account key not found at {SERVICE_ACCOUNT_PATH}")
 
-        creds = service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_PATH,
-            scopes=SCOPES
-        )
-        return creds
+        return credential_manager.get()
 
 else:
     # ---------------- User OAuth Path ----------------
-    from google.auth.transport.requests import Request
-    from google.oauth2.credentials import Credentials
-
     TOKEN_PATH = CURRENT_DIRECTORY / "../../../setup/token.json"
 
+    def _load_token(path: Path):
+        from google.oauth2.credentials import Credentials
+        return Credentials.from_authorized_user_file(path, SCOPES)
+
+    def _refresh_token(creds) -> None:
+        if not creds.refresh_token:
+            raise ValueError("Token is invalid. Please generate a new token.")
+
+        from google.auth.transport.requests import Request
+        try:
+            creds.refresh(Request())
+        except Exception as e:
+            raise ValueError(f"Error refreshing token: {e}")
+
+    credential_manager = CredentialManager(TOKEN_PATH, _load_token, _refresh_token)
+
     def get_creds():
         """
         Returns valid Google API credentials from token.json, refreshing token if necessary.
@@ -41,15 +136,4 @@ else:
         if not TOKEN_PATH.exists():
             raise FileNotFoundError(f"Token not found at {TOKEN_PATH}")
 
-        creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
-
-        if not creds.valid:
-            if creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                except Exception as e:
-                    raise ValueError(f"Error refreshing token: {e}")
-            else:
-                raise ValueError("Token is invalid. Please generate a new token.")
-
-        return creds
\ No newline at end of file
+        return credential_manager.get()
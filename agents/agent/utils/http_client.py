@@ -0,0 +1,161 @@
+import time
+import random
+import bisect
+import threading
+from urllib.parse import urlsplit
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_MAX_SECONDS = 4.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Connection pool size per upstream host
+DEFAULT_POOL_SIZE = 10
+HOST_POOL_SIZES = {
+    "maps.googleapis.com": 20,
+    "weather.googleapis.com": 20,
+    "ipinfo.io": 2,
+}
+
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds) with running count, sum and max."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, elapsed_ms)] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def state(self) -> tuple:
+        """(bucket bounds, per-bucket counts incl. overflow, count, total_ms), read consistently."""
+        with self._lock:
+            return list(self.buckets), list(self.counts), self.count, self.total_ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in self.buckets] + [f">{self.buckets[-1]}ms"]
+            return {
+                "count": self.count,
+                "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+                "max_ms": round(self.max_ms, 2),
+                "buckets": dict(zip(labels, self.counts)),
+            }
+
+
+_session = None
+_session_lock = threading.Lock()
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def get_session():
+    """The shared pooled session, created on first use (requests is slow to import)."""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=len(HOST_POOL_SIZES) + 1, pool_maxsize=DEFAULT_POOL_SIZE))
+                for host, pool_size in HOST_POOL_SIZES.items():
+                    session.mount(f"https://{host}/", HTTPAdapter(pool_maxsize=pool_size))
+                _session = session
+
+    return _session
+
+
+def is_http_error(error: Exception) -> bool:
+    """True for requests.HTTPError, without importing requests up front."""
+    import requests
+    return isinstance(error, requests.HTTPError)
+
+
+def endpoint_name(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def record_latency(endpoint: str, elapsed_ms: float) -> None:
+    with _histograms_lock:
+        histogram = _histograms.get(endpoint)
+        if histogram is None:
+            histogram = _histograms[endpoint] = LatencyHistogram()
+    histogram.observe(elapsed_ms)
+
+
+def get_latency_histograms() -> dict:
+    with _histograms_lock:
+        return dict(_histograms)
+
+
+def get_latency_stats() -> dict:
+    """Latency histograms per upstream endpoint (host + path)."""
+    return {endpoint: histogram.snapshot() for endpoint, histogram in get_latency_histograms().items()}
+
+
+def timed_request(request, endpoint_for=endpoint_name):
+    """Wrap an httplib2-style request(uri, method, ...) so each call is recorded under endpoint_for(uri)."""
+    def request_with_timing(uri, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return request(uri, *args, **kwargs)
+        finally:
+            record_latency(endpoint_for(uri), (time.perf_counter() - started) * 1000)
+    return request_with_timing
+
+
+def backoff_delay(attempt: int, response=None) -> float:
+    """Full-jitter exponential backoff, honouring a numeric Retry-After header when the server sends one."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def http_get(url: str, params: dict = None, timeout=DEFAULT_TIMEOUT, max_retries: int = MAX_RETRIES):
+    """
+    GET through the shared pooled session, with timeouts and retries on 429/5xx and connection errors.
+    Returns the final response (callers still call raise_for_status), or raises the last connection error.
+    """
+    import requests
+
+    session = get_session()
+    endpoint = endpoint_name(url)
+
+    for attempt in range(max_retries + 1):
+        started = time.perf_counter()
+        try:
+            response = session.get(url, params=params, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            record_latency(endpoint, (time.perf_counter() - started) * 1000)
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        record_latency(endpoint, (time.perf_counter() - started) * 1000)
+
+        if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+            return response
+
+        time.sleep(backoff_delay(attempt, response))
@@ -0,0 +1,99 @@
+"""
+Busy/free interval arithmetic shared by the scheduling, free time and time usage tools.
+"""
+import bisect
+import datetime
+
+from .event_store import event_time_to_timestamp
+
+DEFAULT_WORKING_HOURS = "09:00-17:00"
+
+
+class IntervalIndex:
+    """
+    Sorted, merged set of busy intervals (POSIX timestamps).
+    Overlapping and touching intervals are merged on construction, so lookups are a bisect away.
+    """
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, start: float, end: float) -> list:
+        """Merged busy intervals that overlap [start, end)."""
+        first = bisect.bisect_right(self.ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        return list(zip(self.starts[first:last], self.ends[first:last]))
+
+    def gaps(self, start: float, end: float) -> list:
+        """Free intervals within [start, end)."""
+        free = []
+        cursor = start
+        for busy_start, busy_end in self.overlapping(start, end):
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if cursor < end:
+            free.append((cursor, end))
+        return free
+
+
+def parse_working_hours(working_hours: str) -> tuple:
+    """'09:00-17:00' -> (datetime.time(9, 0), datetime.time(17, 0))"""
+    try:
+        start, end = (datetime.time.fromisoformat(part.strip()) for part in working_hours.split("-"))
+    except ValueError:
+        raise ValueError(f"working_hours must look like '09:00-17:00', got: {working_hours}")
+    if end <= start:
+        raise ValueError(f"working_hours must end after they start, got: {working_hours}")
+    return start, end
+
+
+def working_periods(start: datetime.datetime, end: datetime.datetime, working_hours: str = None) -> list:
+    """Split [start, end) into the (local time) working-hour periods it contains, as timestamp pairs."""
+    if not working_hours:
+        return [(start.timestamp(), end.timestamp())]
+
+    day_start, day_end = parse_working_hours(working_hours)
+    start = start.astimezone()
+    end = end.astimezone()
+
+    periods = []
+    day = start.date()
+    while day <= end.date():
+        # astimezone() on the naive local time picks that day's UTC offset, so the hours don't drift across DST changes
+        period_start = max(start, datetime.datetime.combine(day, day_start).astimezone())
+        period_end = min(end, datetime.datetime.combine(day, day_end).astimezone())
+        if period_start < period_end:
+            periods.append((period_start.timestamp(), period_end.timestamp()))
+        day += datetime.timedelta(days=1)
+    return periods
+
+
+def busy_intervals_from_events(events: list) -> list:
+    """(start, end) timestamps of events that block time. Transparent ('free') events are skipped."""
+    return [
+        (event_time_to_timestamp(event["start"]), event_time_to_timestamp(event["end"]))
+        for event in events
+        if event.get("transparency") != "transparent" and event.get("status") != "cancelled"
+    ]
+
+
+def format_slot(start: float, end: float) -> dict:
+    return {
+        "start": datetime.datetime.fromtimestamp(start).astimezone().isoformat(),
+        "end": datetime.datetime.fromtimestamp(end).astimezone().isoformat(),
+        "duration_hours": round((end - start) / 3600.0, 2),
+    }
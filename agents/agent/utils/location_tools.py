@@ -1,21 +1,23 @@
 import os
-import requests
-from dotenv import load_dotenv
-from pathlib import Path
+import time
+import threading
 
-# Load environment variables
-env_path = Path(__file__).resolve().parent / ".env"
-load_dotenv(dotenv_path=env_path)
+from .api_keys import get_maps_api_key
+from .http_client import http_get
+from .geocode_cache import GeocodeCache, GEOCODE_CACHE_PATH
 
-GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
+# The host's public IP rarely changes, so its location is only looked up this often
+CURRENT_LOCATION_TTL_SECONDS = float(os.getenv("CURRENT_LOCATION_TTL_SECONDS", "3600"))
 
-if not GOOGLE_MAPS_API_KEY:
-    raise ValueError("Missing GOOGLE_MAPS_API_KEY in .env file")
+IPINFO_URL = os.getenv("IPINFO_URL", "https://ipinfo.io/json")
+GEOCODE_API_URL = os.getenv("GEOCODE_API_URL", "https://maps.googleapis.com/maps/api/geocode/json")
 
-def get_current_location() -> dict:
+geocode_cache = GeocodeCache(GEOCODE_CACHE_PATH)
+
+def lookup_location_from_ip() -> dict:
     """Get approximate location (city, lat, lon) from public IP address."""
     try:
-        resp = requests.get("https://ipinfo.io/json")
+        resp = http_get(IPINFO_URL)
         resp.raise_for_status()
         data = resp.json()
         loc = data.get("loc", "0,0").split(",")
@@ -26,8 +28,90 @@ def get_current_location() -> dict:
             "lat": loc[0],
             "lon": loc[1]
         }
-    except:
-        raise ValueError(f"Could not determine location from IP")
+    except Exception as e:
+        raise ValueError(f"Could not determine location from IP: {e}")
+
+def location_from_env() -> dict:
+    """A configured starting location from CURRENT_LOCATION_LAT / CURRENT_LOCATION_LON (and optional CITY/REGION/COUNTRY), if set."""
+    lat = os.getenv("CURRENT_LOCATION_LAT")
+    lon = os.getenv("CURRENT_LOCATION_LON")
+    if not lat or not lon:
+        return None
+
+    return {
+        "city": os.getenv("CURRENT_LOCATION_CITY"),
+        "region": os.getenv("CURRENT_LOCATION_REGION"),
+        "country": os.getenv("CURRENT_LOCATION_COUNTRY"),
+        "lat": lat,
+        "lon": lon,
+    }
+
+class LocationResolver:
+    """
+    Caches the current location for ttl seconds.
+    Once the cached value is stale it is still returned while a background refresh runs,
+    and if the lookup fails the last known location keeps being served.
+    An initial location (e.g. from config) is served until its first ttl runs out, then refreshed like any other.
+    """
+
+    def __init__(self, lookup, ttl: float = CURRENT_LOCATION_TTL_SECONDS, initial: dict = None):
+        self._lookup = lookup
+        self.ttl = ttl
+        self._location = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        if initial is not None:
+            self.seed(initial)
+
+    def seed(self, location: dict) -> None:
+        """Start from a known location (e.g. from config) instead of waiting for the first lookup."""
+        with self._lock:
+            self._location = dict(location)
+            self._fetched_at = time.monotonic()
+
+    def get(self) -> dict:
+        with self._lock:
+            location = self._location
+            fresh = location is not None and time.monotonic() - self._fetched_at < self.ttl
+
+        if fresh:
+            return dict(location)
+
+        if location is not None:
+            if self._refresh_lock.acquire(blocking=False):
+                threading.Thread(target=self._refresh_in_background, daemon=True).start()
+            return dict(location)
+
+        # Nothing cached yet: the first caller looks it up, the rest wait for that result
+        with self._refresh_lock:
+            with self._lock:
+                if self._location is not None:
+                    return dict(self._location)
+            return dict(self._refresh())
+
+    def _refresh(self) -> dict:
+        location = self._lookup()
+        with self._lock:
+            self._location = location
+            self._fetched_at = time.monotonic()
+        return location
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._refresh()
+        except ValueError:
+            # Keep serving the last known location; try again after another ttl
+            with self._lock:
+                self._fetched_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+location_resolver = LocationResolver(lookup_location_from_ip, initial=location_from_env())
+
+def get_current_location() -> dict:
+    """Get approximate location (city, lat, lon) from public IP address."""
+    return location_resolver.get()
 
 def get_coords_for_place(place: str) -> dict:
     """
@@ -35,23 +119,32 @@ def get_coords_for_place(place: str) -> dict:
     Raises ValueError if no valid location is found.
     """
     
-    if not GOOGLE_MAPS_API_KEY:
-        raise ValueError("Missing GOOGLE_MAPS_API_KEY in .env file")
+    api_key = get_maps_api_key()
     
     if not place:
         raise ValueError("No place name provided")
 
-    url = "https://maps.googleapis.com/maps/api/geocode/json"
-    params = {"address": place, "key": GOOGLE_MAPS_API_KEY}
+    found, coords = geocode_cache.get(place)
+    if found:
+        if coords is None:
+            raise ValueError(f"Could not find coordinates for place: {place}")
+        return coords
 
-    resp = requests.get(url, params=params)
+    params = {"address": place, "key": api_key}
+
+    resp = http_get(GEOCODE_API_URL, params=params)
     resp.raise_for_status()
     data = resp.json()
 
+    if data["status"] == "ZERO_RESULTS" or (data["status"] == "OK" and not data["results"]):
+        geocode_cache.set(place, None)
+
     if data["status"] != "OK" or not data["results"]:
         raise ValueError(f"Could not find coordinates for place: {place}")
 
     location = data["results"][0]["geometry"]["location"]
     formatted_name = data["results"][0]["formatted_address"]
-    return {"lat": location["lat"], "lon": location["lng"], "name": formatted_name}
+    coords = {"lat": location["lat"], "lon": location["lng"], "name": formatted_name}
+    geocode_cache.set(place, coords)
+    return coords
 
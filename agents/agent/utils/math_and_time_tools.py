@@ -1,8 +1,11 @@
-import math
 import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from functools import lru_cache
 from typing import Optional, Any, TypedDict, Literal, NotRequired, Dict
-import dateparser
-import isodate
+
+from .cache import TTLCache
+from .expression_engine import compile_expression, evaluate
+from .event_projection import parse_event_time
 
 TIME_OF_DAY_RULES = {
     "early morning": (3, 0),
@@ -16,6 +19,44 @@ TIME_OF_DAY_RULES = {
 
 TIME_KEYWORDS = sorted(TIME_OF_DAY_RULES.keys(), key=len, reverse=True)
 
+# Time-of-day ranges used by resolve_time_window; the suggested time is the midpoint
+TIME_OF_DAY_RANGES = {
+    "early morning": ((0, 0), (6, 0)),
+    "mid-morning": ((10, 0), (10, 0)),
+    "morning": ((0, 0), (12, 0)),
+    "early afternoon": ((12, 0), (14, 30)),
+    "afternoon": ((12, 0), (17, 0)),
+    "evening": ((17, 0), (20, 0)),
+    "night": ((19, 0), (24, 0)),
+}
+
+WEEKDAY_NUMBERS = {
+    "monday": 0, "mon": 0,
+    "tuesday": 1, "tue": 1, "tues": 1,
+    "wednesday": 2, "wed": 2,
+    "thursday": 3, "thu": 3, "thur": 3, "thurs": 3,
+    "friday": 4, "fri": 4,
+    "saturday": 5, "sat": 5,
+    "sunday": 6, "sun": 6,
+}
+
+WINDOW_PERIODS = ("week", "month", "year")
+WINDOW_FILLER_WORDS = {"the", "in", "on", "at"}
+
+SELF_ANCHOR_KEYWORDS = [
+    "tomorrow", "yesterday", "today",
+    "next", "last",
+    "tonight", "this",
+    "in ",         # "in 3 hours"
+    "from now",
+]
+
+# Parsed natural-language phrases, keyed on (phrase, anchor bucket, timezone)
+RELATIVE_TIME_CACHE_SIZE = 2048
+RELATIVE_TIME_CACHE_TTL_SECONDS = 24 * 60 * 60
+relative_time_cache = TTLCache(maxsize=RELATIVE_TIME_CACHE_SIZE, ttl=RELATIVE_TIME_CACHE_TTL_SECONDS)
+phrase_is_offset = TTLCache(maxsize=RELATIVE_TIME_CACHE_SIZE)
+
 def extract_date_and_time_phrase(delta: str):
     """
     Split a natural language delta into:
@@ -120,35 +161,22 @@ def get_relative_date_and_time(base_timestamp: Optional[str] = None, delta: str
         if base_timestamp is None:
             base_dt = datetime.datetime.now(datetime.timezone.utc)
         else:
-            base_dt = (
-                dateparser.parse(base_timestamp)
-                if isinstance(base_timestamp, str)
-                else base_timestamp
-            )
+            base_dt = parse_datetime(base_timestamp)
 
         if base_dt.tzinfo is None:
             base_dt = base_dt.replace(tzinfo=datetime.timezone.utc)
 
         return format_to_datetime_dict(base_dt + duration)
 
-    date_phrase, tod_phrase = extract_date_and_time_phrase(delta)
+    date_phrase, tod_phrase = split_delta_phrase(delta)
 
-    has_self_anchor = any(
-        kw in delta_lower
-        for kw in [
-            "tomorrow", "yesterday", "today",
-            "next", "last",
-            "tonight", "this",
-            "in ",         # "in 3 hours"
-            "from now",
-        ]
-    )
+    has_self_anchor = has_self_anchor_keyword(delta_lower)
 
     if date_phrase.strip() == "" and not has_self_anchor:
         if base_timestamp is None:
             base_dt = datetime.datetime.now(datetime.timezone.utc)
         else:
-            base_dt = dateparser.parse(base_timestamp) if isinstance(base_timestamp, str) else base_timestamp
+            base_dt = parse_datetime(base_timestamp)
 
         if base_dt is None or not isinstance(base_dt, datetime.datetime):
             raise ValueError("base_timestamp must be datetime or parseable string")
@@ -159,24 +187,17 @@ def get_relative_date_and_time(base_timestamp: Optional[str] = None, delta: str
         parsed_dt = base_dt
 
     elif has_self_anchor:
-        parsed_dt = dateparser.parse(date_phrase)
+        parsed_dt = parse_relative_phrase(date_phrase)
 
     else:
         if base_timestamp is not None:
-            base_dt = (
-                dateparser.parse(base_timestamp)
-                if isinstance(base_timestamp, str)
-                else base_timestamp
-            )
+            base_dt = parse_datetime(base_timestamp)
             if base_dt.tzinfo is None:
                 base_dt = base_dt.replace(tzinfo=datetime.timezone.utc)
 
-            parsed_dt = dateparser.parse(
-                date_phrase,
-                settings={"RELATIVE_BASE": base_dt},
-            )
+            parsed_dt = parse_relative_phrase(date_phrase, base_dt)
         else:
-            parsed_dt = dateparser.parse(date_phrase)
+            parsed_dt = parse_relative_phrase(date_phrase)
 
     if parsed_dt is None:
         raise ValueError(f"Could not parse date portion: '{date_phrase}'")
@@ -188,27 +209,251 @@ def get_relative_date_and_time(base_timestamp: Optional[str] = None, delta: str
 
     return format_to_datetime_dict(parsed_dt)
 
+def period_start(dt: datetime.datetime, period: str) -> datetime.datetime:
+    """Midnight at the start of the week (Monday), month or year containing dt."""
+    day = dt.date()
+    if period == "week":
+        day -= datetime.timedelta(days=day.weekday())
+    elif period == "month":
+        day = day.replace(day=1)
+    elif period == "year":
+        day = day.replace(month=1, day=1)
+    return datetime.datetime.combine(day, datetime.time(), dt.tzinfo)
+
+def next_period_start(start: datetime.datetime, period: str) -> datetime.datetime:
+    if period == "week":
+        day = start.date() + datetime.timedelta(days=7)
+    elif period == "month":
+        day = start.date().replace(year=start.year + start.month // 12, month=start.month % 12 + 1, day=1)
+    else:
+        day = start.date().replace(year=start.year + 1, month=1, day=1)
+    return datetime.datetime.combine(day, datetime.time(), start.tzinfo)
+
+def previous_period_start(start: datetime.datetime, period: str) -> datetime.datetime:
+    return period_start(start - datetime.timedelta(days=1), period)
+
+def resolve_day_phrase(words: list, now: datetime.datetime) -> Optional[datetime.date]:
+    """The date for 'today', 'tomorrow', 'yesterday' or a weekday name with an optional this/next/last."""
+    today = now.date()
+    if not words or words == ["today"]:
+        return today
+    if words == ["tomorrow"]:
+        return today + datetime.timedelta(days=1)
+    if words == ["yesterday"]:
+        return today - datetime.timedelta(days=1)
+
+    if len(words) > 2:
+        return None
+    modifier, name = words if len(words) == 2 else (None, words[0])
+    if name not in WEEKDAY_NUMBERS or modifier not in (None, "this", "next", "last"):
+        return None
+
+    weekday = WEEKDAY_NUMBERS[name]
+    if modifier == "last":
+        return today - datetime.timedelta(days=(today.weekday() - weekday) % 7 or 7)
+
+    days_ahead = (weekday - today.weekday()) % 7
+    # A bare or "next" weekday is the next occurrence after today; "this Friday" on a Friday is today
+    if days_ahead == 0 and modifier != "this":
+        days_ahead = 7
+    return today + datetime.timedelta(days=days_ahead)
+
+def resolve_time_window(phrase: str, now: Optional[str] = None, tz: Optional[str] = None) -> dict:
+    """
+    Resolve a relative period to a concrete start and end in one step, without any other time tools.
+    Weeks start on Monday. Weekday names mean the next occurrence after today; 'last Friday' is the previous one.
+    'next week/month/year' is that whole period; 'this week/month/year' is from now until the next one starts;
+    'last week/month/year' is the whole previous period.
+    A time of day narrows a day to its range: early morning 00:00-06:00, mid-morning 10:00, morning 00:00-12:00,
+    early afternoon 12:00-14:30, afternoon 12:00-17:00, evening 17:00-20:00, night 19:00-24:00.
+    Examples, with now = Tuesday 2 Nov 2027 15:00:
+        'this week' -> now until Mon 8 Nov 00:00, 'next week' -> Mon 8 Nov 00:00 until Mon 15 Nov 00:00,
+        'next month' -> 1 Dec 00:00 until 1 Jan 00:00, 'Friday' -> Fri 5 Nov, 'next Tuesday' -> Tue 9 Nov,
+        'last Friday' -> Fri 29 Oct, 'tomorrow evening' -> Wed 3 Nov 17:00 until 20:00 (midpoint 18:30).
+    Args:
+        phrase (str): e.g. 'next week', 'this month', 'next Tuesday', 'tomorrow evening', 'tonight'
+        now (str) - optional: ISO timestamp to resolve against. Defaults to the current time.
+        tz (str) - optional: IANA timezone name, e.g. 'Europe/London'. Defaults to the timezone of now, or local time.
+
+    Returns:
+        dict: status, start and end (ISO 8601, end exclusive) and midpoint, the time to suggest when only one is needed.
+    """
+    if not phrase or not phrase.strip():
+        return {"status": "error", "message": "No time phrase provided"}
+
+    try:
+        tzinfo = ZoneInfo(tz) if tz else None
+    except (ZoneInfoNotFoundError, ValueError):
+        return {"status": "error", "message": f"Unknown timezone: {tz}"}
+
+    if now is None:
+        now_dt = datetime.datetime.now(tzinfo).astimezone(tzinfo)
+    else:
+        now_dt = parse_datetime(now)
+        if now_dt is None:
+            return {"status": "error", "message": f"Could not parse now: {now}"}
+        if now_dt.tzinfo is None:
+            now_dt = now_dt.replace(tzinfo=tzinfo) if tzinfo else now_dt.astimezone()
+        elif tzinfo:
+            now_dt = now_dt.astimezone(tzinfo)
+
+    text = " ".join(phrase.lower().replace("tonight", "today night").split())
+    tod_key = next((key for key in TIME_KEYWORDS if key in text), None)
+    if tod_key:
+        text = text.replace(tod_key, " ")
+    words = [word for word in text.split() if word not in WINDOW_FILLER_WORDS]
+
+    if len(words) == 2 and words[0] in ("this", "next", "last") and words[1] in WINDOW_PERIODS:
+        if tod_key:
+            return {"status": "error", "message": f"A time of day can only narrow a single day, got: {phrase}"}
+        modifier, period = words
+        current = period_start(now_dt, period)
+        if modifier == "this":
+            start, end = now_dt, next_period_start(current, period)
+        elif modifier == "next":
+            start = next_period_start(current, period)
+            end = next_period_start(start, period)
+        else:
+            start, end = previous_period_start(current, period), current
+    else:
+        day = resolve_day_phrase(words, now_dt)
+        if day is None:
+            return {"status": "error", "message": f"Could not resolve time window: {phrase}"}
+
+        midnight = datetime.datetime.combine(day, datetime.time(), now_dt.tzinfo)
+        if tod_key:
+            (start_hour, start_minute), (end_hour, end_minute) = TIME_OF_DAY_RANGES[tod_key]
+            start = midnight + datetime.timedelta(hours=start_hour, minutes=start_minute)
+            end = midnight + datetime.timedelta(hours=end_hour, minutes=end_minute)
+        else:
+            start, end = midnight, datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time(), now_dt.tzinfo)
+
+    return {
+        "status": "success",
+        "phrase": phrase,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "midpoint": (start + (end - start) / 2).isoformat(),
+    }
+
+@lru_cache(maxsize=1024)
+def split_delta_phrase(delta: str) -> tuple:
+    """Cached extract_date_and_time_phrase; the split only depends on the phrase itself."""
+    return extract_date_and_time_phrase(delta)
+
+@lru_cache(maxsize=1024)
+def has_self_anchor_keyword(delta_lower: str) -> bool:
+    return any(kw in delta_lower for kw in SELF_ANCHOR_KEYWORDS)
+
+def parse_relative_phrase(date_phrase: str, base_dt: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
+    """
+    Parse a date phrase relative to base_dt (default: now), memoized in relative_time_cache.
+
+    Results come in two shapes, cached differently so entries stay valid as "now" moves:
+    - fixed times ("friday", "at 4pm") only depend on the anchor's date, so they are keyed on the day
+    - offsets that keep the anchor's time of day ("tomorrow", "in 3 hours") are stored as an offset, keyed on the hour
+    """
+    # dateparser's own default anchor is naive local time
+    anchor = base_dt if base_dt is not None else datetime.datetime.now()
+    phrase = " ".join(date_phrase.lower().split())
+    timezone = str(anchor.tzinfo) if anchor.tzinfo is not None else get_local_timezone()
+    naive_anchor = anchor.replace(tzinfo=None)
+
+    # Whether this phrase resolved to an offset last time decides which bucket to look in
+    if phrase_is_offset.get((phrase, timezone)):
+        key = (phrase, naive_anchor.replace(minute=0, second=0, microsecond=0), timezone)
+    else:
+        key = (phrase, naive_anchor.date(), timezone)
+
+    cached = relative_time_cache.get(key)
+    if cached is not None:
+        kind, value, tzinfo = cached
+        if kind == "offset":
+            return (naive_anchor + value).replace(tzinfo=tzinfo)
+        return value
+
+    parsed_dt = parse_datetime(date_phrase, settings={"RELATIVE_BASE": anchor})
+
+    if parsed_dt is not None and is_offset_from_anchor(date_phrase, parsed_dt, anchor):
+        phrase_is_offset.set((phrase, timezone), True)
+        key = (phrase, naive_anchor.replace(minute=0, second=0, microsecond=0), timezone)
+        relative_time_cache.set(key, ("offset", parsed_dt.replace(tzinfo=None) - naive_anchor, parsed_dt.tzinfo))
+    else:
+        phrase_is_offset.set((phrase, timezone), False)
+        key = (phrase, naive_anchor.date(), timezone)
+        # Unparseable phrases are cached too (as None), so they fail fast
+        relative_time_cache.set(key, ("fixed", parsed_dt, None))
+
+    return parsed_dt
+
+def is_offset_from_anchor(date_phrase: str, parsed_dt: datetime.datetime, anchor: datetime.datetime) -> bool:
+    """
+    True if parsed_dt moves with the anchor ("in 20 seconds", "tomorrow") rather than being a fixed time ("at 4pm").
+    Decided by re-parsing against a shifted anchor: an offset moves by exactly the shift, a fixed time stays put.
+    """
+    shift = datetime.timedelta(seconds=1)
+    shifted = parse_datetime(date_phrase, settings={"RELATIVE_BASE": anchor + shift})
+    return shifted is not None and shifted - parsed_dt == shift
+
+def relative_time_cache_stats() -> dict:
+    """Hit/miss statistics for natural-language time resolution."""
+    return relative_time_cache.stats()
+
 def is_datetime_object(x: Any) -> bool:
     return isinstance(x, datetime.datetime)
 
+def parse_datetime(value, settings: Optional[dict] = None) -> Optional[datetime.datetime]:
+    """
+    Parse a datetime, cheapest method first:
+    datetime objects are returned as-is, ISO 8601 / RFC 3339 strings go through datetime.fromisoformat,
+    and only natural language ("tomorrow 9am") falls back to dateparser.
+    Returns None if the value cannot be parsed.
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, datetime.datetime):
+        return value
+
+    text = value.strip()
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        pass
+
+    # RFC 3339 allows a lowercase 't' separator and 'z' suffix
+    if len(text) > 10 and text[10] == "t":
+        try:
+            return datetime.datetime.fromisoformat(text.upper())
+        except ValueError:
+            pass
+
+    # dateparser takes a few hundred ms to import, so only load it once natural language shows up
+    import dateparser
+    return dateparser.parse(text, settings=settings)
+
+def to_calendar_time(timestamp: datetime.datetime) -> str:
+    """Format a datetime for the Google Calendar API; naive datetimes are taken as UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+
+    return timestamp.isoformat(timespec="microseconds").replace("+00:00", "Z")
+
 def format_time_to_calendar(timestamp: str) -> str:
     if timestamp is None:
         return None
 
-    parsed_timestamp = dateparser.parse(timestamp)
+    parsed_timestamp = parse_datetime(timestamp)
     if parsed_timestamp is None:
         return None
 
-    if parsed_timestamp.tzinfo is None:
-        parsed_timestamp = parsed_timestamp.replace(tzinfo=datetime.timezone.utc)
-
-    return parsed_timestamp.isoformat(timespec="microseconds").replace("+00:00", "Z")
+    return to_calendar_time(parsed_timestamp)
 
 
 def format_to_datetime_dict(timestamp: datetime.datetime) -> DateTimeDict:
     return {
         "timestamp": timestamp,
-        "time_google_calendar": format_time_to_calendar(timestamp.isoformat()),
+        "time_google_calendar": to_calendar_time(timestamp),
         "time_iso": timestamp.isoformat(),
         "day_number": str(timestamp.day),
         "day_name": timestamp.strftime("%A"),
@@ -227,6 +472,7 @@ def parse_iso_duration(time_delta: str) -> datetime.timedelta:
         delta_is_negative = True
         time_delta = "P" + time_delta[2:]
 
+    import isodate
     duration = isodate.parse_duration(time_delta)
 
     if not isinstance(duration, datetime.timedelta):
@@ -235,25 +481,52 @@ def parse_iso_duration(time_delta: str) -> datetime.timedelta:
     return -duration if delta_is_negative else duration
 
 def math_tool(expression: str) -> float:
-    allowed_math_functions = {name: value for name, value in math.__dict__.items() if not name.startswith("__")}
-    blocked_builtins = {"__builtins__": {}}
-    return float(eval(expression, blocked_builtins, allowed_math_functions))
+    """
+    Evaluate an arithmetic expression. Numbers, + - * / // % **, and math module functions/constants are allowed.
+    Example: "sqrt(2) * pi"
+    """
+    return evaluate(expression)
 
+def math_tool_batch(expression: str, variables: list[dict]) -> dict:
+    """
+    Evaluate one arithmetic expression for several sets of variable values in a single call.
+    Args:
+        expression (str): e.g. "hours * rate"
+        variables (list of dict): one dict of variable values per evaluation, e.g. [{"hours": 2, "rate": 30}, {"hours": 3, "rate": 30}]
 
-def calculate_time_duration_hours(event: dict):
+    Returns:
+        dict: status and one result per set of variables (None where that evaluation failed, with the error in errors).
+    """
     try:
-        start_str = event["start"]["dateTime"]
-        end_str = event["end"]["dateTime"]
-    except (KeyError, TypeError):
-        return None
+        compiled = compile_expression(expression)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+
+    results = []
+    errors = {}
+    for index, bindings in enumerate(variables or [{}]):
+        try:
+            results.append(float(compiled(bindings)))
+        except (ValueError, ArithmeticError, TypeError) as e:
+            results.append(None)
+            errors[index] = str(e)
 
+    response = {"status": "success", "results": results}
+    if errors:
+        response["errors"] = errors
+    return response
+
+
+def calculate_time_duration_hours(event: dict):
+    """Length of an event in hours. start and end may be ISO strings (as get_events returns them) or Calendar API start/end dicts.
+    Returns None if either time is missing or can't be parsed."""
     try:
-        start_dt = datetime.datetime.fromisoformat(start_str)
-        end_dt = datetime.datetime.fromisoformat(end_str)
-    except ValueError:
+        start_ts, _ = parse_event_time(event["start"])
+        end_ts, _ = parse_event_time(event["end"])
+    except (KeyError, TypeError, ValueError):
         return None
 
-    return (end_dt - start_dt).total_seconds() / 3600.0
+    return (end_ts - start_ts) / 3600.0
 
 
 def get_local_timezone() -> str:
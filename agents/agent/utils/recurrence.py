@@ -0,0 +1,260 @@
+"""
+Local expansion of recurring events, as an alternative to singleEvents=True.
+
+With singleEvents=True the Calendar API sends every instance of every recurring series in the window
+as its own event, so a daily stand-up over a quarter costs ~90 events worth of pages and payload.
+Fetching with singleEvents=False returns each series once (its master, with RRULE/RDATE/EXDATE lines)
+plus the instances that were moved, edited or cancelled, and expand_events turns those back into
+the same instances the API would have sent:
+    - masters are expanded in the series' own time zone, so instances keep their wall-clock time across DST
+    - modified instances replace the occurrence they were moved from (matched on originalStartTime)
+    - cancelled instances and EXDATEs drop their occurrence
+    - instance IDs follow the API's '<series id>_<UTC start>' form, e.g. 'abc123_20250106T090000Z'
+
+Expansion is lazy and bounded by the window: parsed rule sets are cached per series version and
+only occurrences overlapping the window are generated, merged into one stream in start time order.
+"""
+import re
+import heapq
+import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dateutil.rrule import rruleset, rrulestr
+
+from .cache import TTLCache
+from .event_store import event_time_to_timestamp
+
+# Parsed rule sets kept per series; each also remembers the occurrences it has already generated
+RECURRENCE_CACHE_SIZE = 512
+
+UNTIL_VALUE = re.compile(r"UNTIL=([0-9TZ]+)", re.IGNORECASE)
+
+rule_cache = TTLCache(maxsize=RECURRENCE_CACHE_SIZE)
+
+
+def is_all_day(event_time: dict) -> bool:
+    return "date" in event_time and "dateTime" not in event_time
+
+
+def series_timezone(start: dict, dtstart: datetime.datetime):
+    """The zone a series repeats in: its timeZone when set (the API requires one for recurring events), else the start's offset."""
+    try:
+        return ZoneInfo(start["timeZone"]) if start.get("timeZone") else dtstart.tzinfo or datetime.timezone.utc
+    except ZoneInfoNotFoundError:
+        return dtstart.tzinfo or datetime.timezone.utc
+
+
+def parse_ical_time(value: str, tzinfo, all_day: bool, default_time: datetime.time) -> datetime.datetime:
+    """
+    Parse an iCalendar DATE or DATE-TIME value ('20250106', '20250106T090000' or '20250106T090000Z').
+    Timed series get aware datetimes in tzinfo; all-day series get naive midnights, like their occurrences.
+    """
+    if "T" not in value.upper():
+        day = datetime.datetime.strptime(value, "%Y%m%d")
+        if all_day:
+            return day
+        return datetime.datetime.combine(day.date(), default_time, tzinfo)
+
+    utc = value.upper().endswith("Z")
+    moment = datetime.datetime.strptime(value.upper().rstrip("Z"), "%Y%m%dT%H%M%S")
+    if all_day:
+        return moment.replace(hour=0, minute=0, second=0)
+    if utc:
+        return moment.replace(tzinfo=datetime.timezone.utc).astimezone(tzinfo)
+    return moment.replace(tzinfo=tzinfo)
+
+
+def normalize_until(rule: str, tzinfo, all_day: bool) -> str:
+    """
+    dateutil wants UNTIL in UTC for aware series and floating for all-day ones; the API accepts either form.
+    A date-only UNTIL on a timed series includes that whole day.
+    """
+    def replace(match):
+        value = match.group(1).upper()
+        if all_day:
+            return f"UNTIL={value.rstrip('Z')}"
+        if value.endswith("Z"):
+            return f"UNTIL={value}"
+        until = parse_ical_time(value, tzinfo, False, datetime.time(23, 59, 59))
+        return f"UNTIL={until.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%SZ}"
+
+    return UNTIL_VALUE.sub(replace, rule)
+
+
+def parse_date_list(line: str, tzinfo, all_day: bool, default_time: datetime.time) -> list:
+    """Datetimes of an RDATE/EXDATE line, e.g. 'EXDATE;TZID=Europe/London:20250106T090000,20250107T090000'."""
+    name, _, values = line.partition(":")
+    params = dict(param.split("=", 1) for param in name.split(";")[1:] if "=" in param)
+
+    value_tz = tzinfo
+    if params.get("TZID"):
+        try:
+            value_tz = ZoneInfo(params["TZID"])
+        except ZoneInfoNotFoundError:
+            pass
+
+    dates = []
+    for value in values.split(","):
+        # PERIOD values ('start/end') aren't produced by Google Calendar
+        if not value or "/" in value:
+            continue
+        moment = parse_ical_time(value.strip(), value_tz, all_day, default_time)
+        dates.append(moment if all_day else moment.astimezone(tzinfo))
+    return dates
+
+
+def build_rules(recurrence: list, dtstart: datetime.datetime, tzinfo, all_day: bool) -> rruleset:
+    """rruleset for a series' RRULE/EXRULE/RDATE/EXDATE lines. cache=True keeps generated occurrences for later windows."""
+    rules = rruleset(cache=True)
+    for line in recurrence:
+        kind = line.split(":", 1)[0].split(";", 1)[0].upper()
+        if kind in ("RRULE", "EXRULE"):
+            rule = rrulestr(normalize_until(line, tzinfo, all_day), dtstart=dtstart)
+            if kind == "RRULE":
+                rules.rrule(rule)
+            else:
+                rules.exrule(rule)
+        elif kind in ("RDATE", "EXDATE"):
+            for moment in parse_date_list(line, tzinfo, all_day, dtstart.time()):
+                if kind == "RDATE":
+                    rules.rdate(moment)
+                else:
+                    rules.exdate(moment)
+
+    # A series always starts at its own start, even if the rule wouldn't generate it (RFC 5545 3.8.5.3)
+    rules.rdate(dtstart)
+    return rules
+
+
+class RecurringSeries:
+    """A recurring master event and its parsed rules, expandable over any window."""
+
+    def __init__(self, master: dict, rules: rruleset = None):
+        self.master = master
+        start = master["start"]
+        end = master["end"]
+        self.all_day = is_all_day(start)
+
+        if self.all_day:
+            self.dtstart = datetime.datetime.fromisoformat(start["date"])
+            self.duration = datetime.datetime.fromisoformat(end["date"]) - self.dtstart
+            self.tzinfo = None
+        else:
+            self.dtstart = datetime.datetime.fromisoformat(start["dateTime"])
+            self.tzinfo = series_timezone(start, self.dtstart)
+            self.dtstart = self.localize(self.dtstart)
+            self.duration = self.localize(datetime.datetime.fromisoformat(end["dateTime"])) - self.dtstart
+
+        self.rules = rules if rules is not None else build_rules(master.get("recurrence") or [], self.dtstart, self.tzinfo, self.all_day)
+
+    def localize(self, moment: datetime.datetime) -> datetime.datetime:
+        # Written events may carry a local time plus timeZone instead of an offset
+        if moment.tzinfo is None:
+            return moment.replace(tzinfo=self.tzinfo or datetime.timezone.utc)
+        return moment.astimezone(self.tzinfo)
+
+    def occurrences(self, window_start: datetime.datetime, window_end: datetime.datetime):
+        """Lazily yield the start of each occurrence that overlaps [window_start, window_end), in order."""
+        if self.all_day:
+            # All-day occurrences are local dates, compared the way event_time_to_timestamp reads them
+            window_start = window_start.astimezone().replace(tzinfo=None)
+            window_end = window_end.astimezone().replace(tzinfo=None)
+
+        for start in self.rules.xafter(window_start - self.duration, inc=False):
+            if start >= window_end:
+                return
+            yield start
+
+    def event_time(self, moment: datetime.datetime) -> dict:
+        if self.all_day:
+            return {"date": moment.date().isoformat()}
+        return {"dateTime": moment.isoformat(), "timeZone": self.master["start"].get("timeZone") or str(self.tzinfo)}
+
+    def instance_id(self, start: datetime.datetime) -> str:
+        if self.all_day:
+            return f"{self.master['id']}_{start:%Y%m%d}"
+        return f"{self.master['id']}_{start.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%SZ}"
+
+    def instance(self, start: datetime.datetime) -> dict:
+        """The event the API would return for the occurrence starting at start."""
+        instance = {key: value for key, value in self.master.items() if key not in ("recurrence", "updated")}
+        instance["id"] = self.instance_id(start)
+        instance["start"] = self.event_time(start)
+        instance["end"] = self.event_time(start + self.duration)
+        instance["recurringEventId"] = self.master["id"]
+        instance["originalStartTime"] = dict(instance["start"])
+        return instance
+
+    def instances(self, window_start: datetime.datetime, window_end: datetime.datetime, exceptions: dict):
+        """
+        Lazily yield the series' instances overlapping the window, in start time order.
+        exceptions maps originalStartTime timestamps to the modified or cancelled instance that replaces them;
+        occurrences with an exception are skipped here, modified instances are merged in by the caller.
+        """
+        for start in self.occurrences(window_start, window_end):
+            instance = self.instance(start)
+            if event_time_to_timestamp(instance["originalStartTime"]) in exceptions:
+                continue
+            yield instance
+
+
+def series_for(master: dict) -> RecurringSeries:
+    """Series for a master event. Its parsed rules are cached until the recurrence or start/end is edited."""
+    key = (
+        master["id"],
+        tuple(master.get("recurrence") or ()),
+        tuple(sorted(master["start"].items())),
+        tuple(sorted(master["end"].items())),
+    )
+    rules = rule_cache.get(key)
+    series = RecurringSeries(master, rules)
+    if rules is None:
+        rule_cache.set(key, series.rules)
+    return series
+
+
+def overlaps(event: dict, window_start: float, window_end: float) -> bool:
+    return event_time_to_timestamp(event["start"]) < window_end and event_time_to_timestamp(event["end"]) > window_start
+
+
+def expand_events(items: list, window_start: datetime.datetime, window_end: datetime.datetime):
+    """
+    Lazily yield the events of a singleEvents=False (showDeleted=True) listing as singleEvents=True would
+    return them: single events and every instance overlapping [window_start, window_end), in start time order.
+    """
+    start_ts = window_start.timestamp()
+    end_ts = window_end.timestamp()
+
+    masters = {}
+    exceptions = {}
+    singles = []
+    for item in items:
+        if item.get("recurrence"):
+            masters[item["id"]] = item
+        elif item.get("recurringEventId") and item.get("originalStartTime"):
+            original = event_time_to_timestamp(item["originalStartTime"])
+            exceptions.setdefault(item["recurringEventId"], {})[original] = item
+        elif item.get("status") != "cancelled":
+            singles.append(item)
+
+    for series_id, modified in exceptions.items():
+        master = masters.get(series_id)
+        # Instances of a cancelled series go with it
+        if master is not None and master.get("status") == "cancelled":
+            continue
+        singles.extend(
+            instance for instance in modified.values()
+            if instance.get("status") != "cancelled" and overlaps(instance, start_ts, end_ts)
+        )
+
+    singles = [event for event in singles if overlaps(event, start_ts, end_ts)]
+    singles.sort(key=lambda event: event_time_to_timestamp(event["start"]))
+
+    streams = [singles]
+    for series_id, master in masters.items():
+        if master.get("status") == "cancelled":
+            continue
+        streams.append(series_for(master).instances(window_start, window_end, exceptions.get(series_id, {})))
+
+    # heapq.merge is stable, so events starting together keep their stream order
+    yield from heapq.merge(*streams, key=lambda event: event_time_to_timestamp(event["start"]))
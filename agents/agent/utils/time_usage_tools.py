@@ -0,0 +1,140 @@
+import datetime
+from array import array
+from collections import defaultdict
+
+from googleapiclient.errors import HttpError
+
+from .handle_credentials import get_creds
+from .calendar_tools import query_events, resolve_query_window
+from .event_projection import parse_event_time
+from .intervals import DEFAULT_WORKING_HOURS, IntervalIndex, format_slot, working_periods
+
+
+def parse_event_times(events: list, include_all_day: bool = False) -> tuple:
+    """Parse every event's start/end in one pass into compact arrays of timestamps. Unparseable events are counted, not raised."""
+    starts = array("d")
+    ends = array("d")
+    skipped = 0
+    all_day_count = 0
+
+    for event in events:
+        try:
+            start, start_all_day = parse_event_time(event["start"])
+            end, _ = parse_event_time(event["end"])
+        except (KeyError, TypeError, ValueError):
+            skipped += 1
+            continue
+
+        if start_all_day:
+            all_day_count += 1
+            if not include_all_day:
+                continue
+
+        starts.append(start)
+        ends.append(end)
+
+    return starts, ends, all_day_count, skipped
+
+
+def split_by_day(start: float, end: float):
+    """Yield (local date, seconds) for each day [start, end) touches."""
+    cursor = datetime.datetime.fromtimestamp(start).astimezone()
+    end_dt = datetime.datetime.fromtimestamp(end).astimezone()
+
+    while cursor < end_dt:
+        # Localized per day, so a DST change doesn't shift the following midnights
+        next_midnight = datetime.datetime.combine(cursor.date() + datetime.timedelta(days=1), datetime.time()).astimezone()
+        segment_end = min(end_dt, next_midnight)
+        yield cursor.date(), (segment_end - cursor).total_seconds()
+        cursor = segment_end
+
+
+def summarize_time_usage(events: list[dict] = None, start_time=None, end_time=None,
+                         working_hours: str = DEFAULT_WORKING_HOURS, include_all_day: bool = False) -> dict:
+    """
+    Summarize how much time is taken up by events, e.g. "how many hours of meetings do I have this week?".
+    Args:
+        events (list of dict) - optional: events to summarize (as returned by get_events). If omitted, the calendar is read for the window.
+        start_time - optional: start of the window. Defaults to the first event's start, or now when reading the calendar.
+        end_time - optional: end of the window. Defaults to the last event's end, or 1 week after start_time when reading the calendar.
+        working_hours (str) - optional: daily working hours for utilization, e.g. '09:00-17:00'.
+        include_all_day (bool) - optional: count all-day events as busy time. Defaults to False.
+
+    Returns:
+        dict: status, total scheduled and busy hours (overlaps counted once), per-day and per-week busy hours,
+        the longest busy block, and utilization of working hours.
+    """
+    try:
+        if events is None:
+            try:
+                creds = get_creds()
+            except Exception as e:
+                return {"status": "error", "message": f"Cannot get credentials: {e}"}
+
+            _, _, start_time, end_time = resolve_query_window(start_time, end_time)
+            events = query_events(creds, start_time, end_time)
+
+        starts, ends, all_day_count, skipped = parse_event_times(events, include_all_day)
+
+        # Without an explicit window, summarize the span the given events cover
+        if starts and start_time is None:
+            start_time = datetime.datetime.fromtimestamp(min(starts)).astimezone()
+        if starts and end_time is None:
+            end_time = datetime.datetime.fromtimestamp(max(ends)).astimezone()
+
+        _, _, start_time, end_time = resolve_query_window(start_time, end_time)
+        window_start = datetime.datetime.fromisoformat(start_time)
+        window_end = datetime.datetime.fromisoformat(end_time)
+        window_start_ts = window_start.timestamp()
+        window_end_ts = window_end.timestamp()
+
+        # Clip every event to the window before merging
+        clipped = [
+            (max(start, window_start_ts), min(end, window_end_ts))
+            for start, end in zip(starts, ends)
+            if start < window_end_ts and end > window_start_ts
+        ]
+        busy = IntervalIndex(clipped)
+        blocks = busy.overlapping(window_start_ts, window_end_ts)
+
+        per_day = defaultdict(float)
+        per_week = defaultdict(float)
+        for block_start, block_end in blocks:
+            for day, seconds in split_by_day(block_start, block_end):
+                per_day[day.isoformat()] += seconds
+                year, week, _ = day.isocalendar()
+                per_week[f"{year}-W{week:02d}"] += seconds
+
+        busy_seconds = sum(block_end - block_start for block_start, block_end in blocks)
+        longest = max(blocks, key=lambda block: block[1] - block[0], default=None)
+
+        working_seconds = 0.0
+        busy_working_seconds = 0.0
+        for period_start, period_end in working_periods(window_start, window_end, working_hours):
+            working_seconds += period_end - period_start
+            busy_working_seconds += sum(
+                min(block_end, period_end) - max(block_start, period_start)
+                for block_start, block_end in busy.overlapping(period_start, period_end)
+            )
+
+        summary = {
+            "status": "success",
+            "start": window_start.astimezone().isoformat(),
+            "end": window_end.astimezone().isoformat(),
+            "event_count": len(clipped),
+            "all_day_event_count": all_day_count,
+            "scheduled_hours": round(sum(end - start for start, end in clipped) / 3600.0, 2),
+            "busy_hours": round(busy_seconds / 3600.0, 2),
+            "busy_hours_per_day": {day: round(seconds / 3600.0, 2) for day, seconds in sorted(per_day.items())},
+            "busy_hours_per_week": {week: round(seconds / 3600.0, 2) for week, seconds in sorted(per_week.items())},
+            "longest_block": format_slot(*longest) if longest else None,
+            "working_hours_utilization": round(busy_working_seconds / working_seconds, 3) if working_seconds else None,
+        }
+        if skipped:
+            summary["message"] = f"{skipped} events without a readable start/end were skipped."
+        return summary
+
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    except HttpError as error:
+        return {"status": "error", "message": f"An error occurred: {error}"}
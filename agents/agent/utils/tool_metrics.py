@@ -0,0 +1,227 @@
+"""
+Per-tool instrumentation for the agent's FunctionTools.
+
+instrument_tool wraps a tool (sync or async) and records, per tool name: a latency histogram,
+calls by outcome (the result's 'status', or 'exception' when the tool raised) and response sizes.
+Upstream HTTP timings come from http_client's per-endpoint histograms, which cover the Calendar,
+Geocoding, Weather and ipinfo APIs.
+
+Metrics stay in memory and are written to TOOL_METRICS_EXPORT_PATH, as a Prometheus text file
+(for node_exporter's textfile collector) or as JSON lines, every TOOL_METRICS_EXPORT_INTERVAL_SECONDS
+and at exit. Set TOOL_METRICS_ENABLED=false to register the tools unwrapped.
+"""
+import os
+import time
+import json
+import atexit
+import inspect
+import tempfile
+import functools
+import threading
+
+from .http_client import LatencyHistogram, get_latency_histograms
+
+TOOL_METRICS_ENABLED = os.getenv("TOOL_METRICS_ENABLED", "true").lower() == "true"
+TOOL_METRICS_EXPORT_PATH = os.getenv("TOOL_METRICS_EXPORT_PATH")
+# "prometheus" or "jsonl"
+TOOL_METRICS_EXPORT_FORMAT = os.getenv("TOOL_METRICS_EXPORT_FORMAT", "prometheus")
+TOOL_METRICS_EXPORT_INTERVAL_SECONDS = float(os.getenv("TOOL_METRICS_EXPORT_INTERVAL_SECONDS", "60"))
+
+METRIC_PREFIX = "agent"
+
+
+class ToolMetrics:
+    """Latency, outcomes and response sizes for one tool."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.outcomes = {}
+        self.response_bytes = 0
+        self.max_response_bytes = 0
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_ms: float, outcome: str, response_bytes: int) -> None:
+        self.latency.observe(elapsed_ms)
+        with self._lock:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            self.response_bytes += response_bytes
+            self.max_response_bytes = max(self.max_response_bytes, response_bytes)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            outcomes = dict(self.outcomes)
+            response_bytes = self.response_bytes
+            max_response_bytes = self.max_response_bytes
+        latency = self.latency.snapshot()
+        return {
+            "calls": latency["count"],
+            "outcomes": outcomes,
+            "errors": sum(count for outcome, count in outcomes.items() if outcome != "success"),
+            "latency": latency,
+            "response_bytes": response_bytes,
+            "mean_response_bytes": round(response_bytes / latency["count"]) if latency["count"] else 0,
+            "max_response_bytes": max_response_bytes,
+        }
+
+
+_tool_metrics = {}
+_tool_metrics_lock = threading.Lock()
+
+
+def metrics_for(tool_name: str) -> ToolMetrics:
+    with _tool_metrics_lock:
+        metrics = _tool_metrics.get(tool_name)
+        if metrics is None:
+            metrics = _tool_metrics[tool_name] = ToolMetrics()
+        return metrics
+
+
+def result_outcome(result) -> str:
+    if isinstance(result, dict) and result.get("status") in ("success", "error"):
+        return result["status"]
+    return "success"
+
+
+def response_size(result) -> int:
+    """Serialized size of a tool response in bytes; this is what gets sent back to the model."""
+    try:
+        return len(json.dumps(result, default=str, separators=(",", ":")).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def instrument_tool(fn):
+    """Wrap a tool so each call is timed and recorded. Name, signature and docstring are kept for FunctionTool."""
+    if not TOOL_METRICS_ENABLED:
+        return fn
+
+    metrics = metrics_for(fn.__name__)
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException:
+                metrics.observe((time.perf_counter() - started) * 1000, "exception", 0)
+                raise
+            metrics.observe((time.perf_counter() - started) * 1000, result_outcome(result), response_size(result))
+            return result
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            metrics.observe((time.perf_counter() - started) * 1000, "exception", 0)
+            raise
+        metrics.observe((time.perf_counter() - started) * 1000, result_outcome(result), response_size(result))
+        return result
+    return wrapper
+
+
+def get_tool_metrics() -> dict:
+    """Per-tool metrics, plus upstream HTTP latency per endpoint."""
+    with _tool_metrics_lock:
+        tool_metrics = dict(_tool_metrics)
+    return {
+        "tools": {name: metrics.snapshot() for name, metrics in sorted(tool_metrics.items())},
+        "upstream": {endpoint: histogram.snapshot() for endpoint, histogram in sorted(get_latency_histograms().items())},
+    }
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def prometheus_histogram(name: str, label: str, histograms: dict) -> list:
+    lines = [f"# TYPE {name} histogram"]
+    for key, histogram in sorted(histograms.items()):
+        bounds, counts, count, total_ms = histogram.state()
+        labels = f"{label}=\"{escape_label(key)}\""
+        cumulative = 0
+        for bound, bucket_count in zip(bounds, counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{{{labels},le=\"{bound}\"}} {cumulative}")
+        lines.append(f"{name}_bucket{{{labels},le=\"+Inf\"}} {count}")
+        lines.append(f"{name}_sum{{{labels}}} {total_ms:.3f}")
+        lines.append(f"{name}_count{{{labels}}} {count}")
+    return lines
+
+
+def render_prometheus() -> str:
+    with _tool_metrics_lock:
+        tool_metrics = dict(_tool_metrics)
+
+    lines = [f"# TYPE {METRIC_PREFIX}_tool_calls_total counter"]
+    response_lines = [f"# TYPE {METRIC_PREFIX}_tool_response_bytes_total counter"]
+    max_response_lines = [f"# TYPE {METRIC_PREFIX}_tool_response_bytes_max gauge"]
+    for name, metrics in sorted(tool_metrics.items()):
+        snapshot = metrics.snapshot()
+        tool = escape_label(name)
+        for outcome, count in sorted(snapshot["outcomes"].items()):
+            lines.append(f"{METRIC_PREFIX}_tool_calls_total{{tool=\"{tool}\",status=\"{outcome}\"}} {count}")
+        response_lines.append(f"{METRIC_PREFIX}_tool_response_bytes_total{{tool=\"{tool}\"}} {snapshot['response_bytes']}")
+        max_response_lines.append(f"{METRIC_PREFIX}_tool_response_bytes_max{{tool=\"{tool}\"}} {snapshot['max_response_bytes']}")
+
+    lines += response_lines + max_response_lines
+    lines += prometheus_histogram(f"{METRIC_PREFIX}_tool_latency_milliseconds", "tool",
+                                  {name: metrics.latency for name, metrics in tool_metrics.items()})
+    lines += prometheus_histogram(f"{METRIC_PREFIX}_upstream_latency_milliseconds", "endpoint", get_latency_histograms())
+    return "\n".join(lines) + "\n"
+
+
+def export_metrics(path: str = None, export_format: str = None) -> None:
+    """
+    Write the current metrics to path. Prometheus files are replaced atomically, so a scraper never
+    reads a half-written file; JSON lines get one timestamped snapshot appended per export.
+    """
+    path = path or TOOL_METRICS_EXPORT_PATH
+    export_format = export_format or TOOL_METRICS_EXPORT_FORMAT
+    if not path:
+        return
+
+    if export_format == "jsonl":
+        with open(path, "a") as file:
+            file.write(json.dumps(dict(get_tool_metrics(), timestamp=time.time())) + "\n")
+        return
+
+    if export_format != "prometheus":
+        raise ValueError(f"export_format must be 'prometheus' or 'jsonl', got: {export_format}")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as file:
+        file.write(render_prometheus())
+    os.replace(file.name, path)
+
+
+_exporter = None
+
+
+def start_metrics_exporter(path: str = None, interval: float = TOOL_METRICS_EXPORT_INTERVAL_SECONDS):
+    """Export metrics every interval seconds on a daemon thread, and once more at exit. No-op without an export path."""
+    global _exporter
+
+    path = path or TOOL_METRICS_EXPORT_PATH
+    if not TOOL_METRICS_ENABLED or not path or _exporter is not None:
+        return _exporter
+
+    def export_quietly():
+        try:
+            export_metrics(path)
+        except OSError:
+            # Keep collecting; the next export tries again
+            pass
+
+    def export_periodically():
+        while True:
+            time.sleep(interval)
+            export_quietly()
+
+    _exporter = threading.Thread(target=export_periodically, name="tool-metrics-exporter", daemon=True)
+    _exporter.start()
+    atexit.register(export_quietly)
+    return _exporter
@@ -1,15 +1,51 @@
 import os
-from dotenv import load_dotenv
-from pathlib import Path
-import requests
 
-env_path = Path(__file__).resolve().parent / ".env"
-load_dotenv(dotenv_path=env_path)
+from .api_keys import get_maps_api_key
+from .cache import TTLCache, SingleFlight
+from .http_client import http_get, is_http_error
 
-GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
+# Nearby callers share one reading: precision 5 is a ~5km x 5km cell
+WEATHER_GEOHASH_PRECISION = int(os.getenv("WEATHER_GEOHASH_PRECISION", "5"))
+WEATHER_CACHE_TTL_SECONDS = float(os.getenv("WEATHER_CACHE_TTL_SECONDS", "300"))
 
-if not GOOGLE_MAPS_API_KEY:
-    raise ValueError("Missing GOOGLE_MAPS_API_KEY in .env file")
+WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://weather.googleapis.com/v1/currentConditions:lookup")
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+weather_cache = TTLCache(maxsize=4096, ttl=WEATHER_CACHE_TTL_SECONDS)
+weather_requests = SingleFlight()
+
+def geohash(lat: float, lon: float, precision: int = WEATHER_GEOHASH_PRECISION) -> str:
+    """Encode coordinates as a geohash; nearby points share a prefix."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    cell = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(cell) < precision:
+        value, value_range = (lon, lon_range) if even else (lat, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            value_range[0] = mid
+        else:
+            bits <<= 1
+            value_range[1] = mid
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            cell.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(cell)
+
+def get_weather_cache_stats() -> dict:
+    """Weather cache metrics, including how many concurrent lookups shared an in-flight request."""
+    return dict(weather_cache.stats(), coalesced=weather_requests.coalesced)
 
 def get_current_weather(coords: dict) -> dict:
     """
@@ -24,26 +60,41 @@ def get_current_weather(coords: dict) -> dict:
     if not coords or "lat" not in coords or "lon" not in coords:
         raise ValueError("Coordinates must be provided as a dict with 'lat' and 'lon'.")
 
-    base_url = "https://weather.googleapis.com/v1/currentConditions:lookup"
-    params = {
-        "key": GOOGLE_MAPS_API_KEY,
-        "location.latitude": coords["lat"],
-        "location.longitude": coords["lon"],
-    }
-
     try:
-        response = requests.get(base_url, params=params)
+        cell = geohash(float(coords["lat"]), float(coords["lon"]))
+    except (TypeError, ValueError):
+        raise ValueError("Coordinates 'lat' and 'lon' must be numbers.")
+
+    cached = weather_cache.get(cell)
+    if cached is not None:
+        return cached
+
+    api_key = get_maps_api_key()
+
+    def fetch_weather() -> dict:
+        params = {
+            "key": api_key,
+            "location.latitude": coords["lat"],
+            "location.longitude": coords["lon"],
+        }
+
+        response = http_get(WEATHER_API_URL, params=params)
         response.raise_for_status()
-        return {
+        result = {
             "status": "success",
             "weather": response.json()
         }
-    except requests.HTTPError as e:
-        return {
-            "status": "error",
-            "message": f"HTTP error: {e}"
-        }
+        weather_cache.set(cell, result)
+        return result
+
+    try:
+        return weather_requests.do(cell, fetch_weather)
     except Exception as e:
+        if is_http_error(e):
+            return {
+                "status": "error",
+                "message": f"HTTP error: {e}"
+            }
         return {
             "status": "error",
             "message": str(e)
@@ -0,0 +1,58 @@
+"""
+Micro-benchmark for datetime parsing on the get_relative_date_and_time / format_to_datetime_dict path.
+Compares the fast ISO path against parsing everything with dateparser (the previous behaviour).
+
+Run from the project root:
+    $ python -m benchmarks.bench_datetime_parsing
+"""
+import datetime
+import timeit
+
+import dateparser
+
+from agents.agent.utils.math_and_time_tools import (
+    format_time_to_calendar, format_to_datetime_dict, get_relative_date_and_time
+)
+
+ITERATIONS = 2000
+
+
+def format_time_to_calendar_with_dateparser(timestamp: str) -> str:
+    parsed_timestamp = dateparser.parse(timestamp)
+    if parsed_timestamp.tzinfo is None:
+        parsed_timestamp = parsed_timestamp.replace(tzinfo=datetime.timezone.utc)
+    return parsed_timestamp.isoformat(timespec="microseconds").replace("+00:00", "Z")
+
+
+def report(name: str, baseline, candidate) -> None:
+    baseline_us = timeit.timeit(baseline, number=ITERATIONS) / ITERATIONS * 1e6
+    candidate_us = timeit.timeit(candidate, number=ITERATIONS) / ITERATIONS * 1e6
+    print(f"{name:<40} dateparser {baseline_us:9.1f} us   fast path {candidate_us:7.1f} us   {baseline_us / candidate_us:6.1f}x")
+
+
+def main() -> None:
+    now = datetime.datetime.now().astimezone()
+    iso = now.isoformat()
+
+    # Warm up dateparser's lazily loaded language data so it isn't billed to the first run
+    dateparser.parse(iso)
+
+    report(
+        "format_time_to_calendar(iso string)",
+        lambda: format_time_to_calendar_with_dateparser(iso),
+        lambda: format_time_to_calendar(iso),
+    )
+    report(
+        "format_to_datetime_dict(datetime)",
+        lambda: format_time_to_calendar_with_dateparser(now.isoformat()),
+        lambda: format_to_datetime_dict(now),
+    )
+    report(
+        "get_relative_date_and_time(iso, 'P1W')",
+        lambda: format_time_to_calendar_with_dateparser((dateparser.parse(iso) + datetime.timedelta(weeks=1)).isoformat()),
+        lambda: get_relative_date_and_time(iso, "P1W"),
+    )
+
+
+if __name__ == "__main__":
+    main()
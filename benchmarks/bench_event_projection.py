@@ -0,0 +1,56 @@
+"""
+Payload size of calendar tool responses: raw Google Calendar event resources vs the compact projection
+at each verbosity level, in bytes and approximate tokens. Prints one JSON object per level.
+
+Run from the project root:
+    $ python -m benchmarks.bench_event_projection
+    $ python -m benchmarks.bench_event_projection 200
+"""
+import sys
+import json
+import datetime
+
+from agents.agent.utils.event_projection import VERBOSITY_LEVELS, measure_projection_savings
+
+
+def sample_event(index: int) -> dict:
+    """A full events().list item, shaped like what the Calendar API returns for a typical meeting."""
+    start = datetime.datetime(2025, 11, 24, 9, tzinfo=datetime.timezone.utc) + datetime.timedelta(hours=3 * index)
+    end = start + datetime.timedelta(hours=1)
+    return {
+        "kind": "calendar#event",
+        "etag": f"\"33{index:014d}\"",
+        "id": f"4u1k3n5b2q8r{index:06d}",
+        "status": "confirmed",
+        "htmlLink": f"https://www.google.com/calendar/event?eid=NHUxazNuNWIycThy{index:06d}",
+        "created": "2025-11-20T10:15:32.000Z",
+        "updated": "2025-11-21T08:02:11.412Z",
+        "summary": f"Project Sync {index}",
+        "description": "Weekly sync on project status, blockers and next steps.",
+        "location": "Meeting Room 2, 10 Example Street, London",
+        "creator": {"email": "organizer@example.com", "self": True},
+        "organizer": {"email": "organizer@example.com", "self": True},
+        "start": {"dateTime": start.isoformat(), "timeZone": "Europe/London"},
+        "end": {"dateTime": end.isoformat(), "timeZone": "Europe/London"},
+        "iCalUID": f"4u1k3n5b2q8r{index:06d}@google.com",
+        "sequence": 0,
+        "attendees": [
+            {"email": "organizer@example.com", "organizer": True, "self": True, "responseStatus": "accepted"},
+            {"email": "alex@example.com", "responseStatus": "needsAction"},
+            {"email": "sam@example.com", "responseStatus": "accepted"},
+        ],
+        "reminders": {"useDefault": True},
+        "eventType": "default",
+    }
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    events = [sample_event(index) for index in range(count)]
+
+    for verbosity in VERBOSITY_LEVELS:
+        print(json.dumps(dict(measure_projection_savings(events, verbosity), events=count)))
+
+
+if __name__ == "__main__":
+    main()
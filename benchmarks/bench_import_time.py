@@ -0,0 +1,79 @@
+"""
+Cold-start import cost per module, measured with `python -X importtime` in a fresh interpreter.
+Prints one JSON object per module (cumulative import time plus its slowest direct dependencies),
+so runs can be compared across commits.
+
+Run from the project root:
+    $ python -m benchmarks.bench_import_time
+    $ python -m benchmarks.bench_import_time agents.agent.utils.calendar_tools
+"""
+import os
+import re
+import sys
+import json
+import subprocess
+
+MODULES = [
+    "agents.agent.utils.math_and_time_tools",
+    "agents.agent.utils.calendar_tools",
+    "agents.agent.utils.free_busy_tools",
+    "agents.agent.utils.location_tools",
+    "agents.agent.utils.weather_tools",
+    "agents.agent.utils.async_tools",
+    "agents.agent.calendar_agent_team",
+    "agents.agent.agent",
+]
+
+# Runs per module; the fastest is reported, to keep disk cache noise out of the numbers
+REPEATS = 3
+TOP_DEPENDENCIES = 5
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def measure(module: str) -> dict:
+    """Import a module in a fresh interpreter and parse its -X importtime report."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.splitlines()[-1]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, len(indent), int(cumulative_us)))
+
+    # -X importtime lists a module's dependencies, more deeply indented, just before the module itself
+    index = next(i for i, (name, _, _) in enumerate(entries) if name == module)
+    _, depth, cumulative_us = entries[index]
+    dependencies = []
+    for name, dependency_depth, dependency_us in reversed(entries[:index]):
+        if dependency_depth <= depth:
+            break
+        if dependency_depth == depth + 2:
+            dependencies.append((name, dependency_us))
+
+    return {
+        "module": module,
+        "cumulative_ms": round(cumulative_us / 1000, 2),
+        "slowest_dependencies": {
+            name: round(dependency_us / 1000, 2)
+            for name, dependency_us in sorted(dependencies, key=lambda item: item[1], reverse=True)[:TOP_DEPENDENCIES]
+        },
+    }
+
+
+def main() -> None:
+    for module in sys.argv[1:] or MODULES:
+        runs = [measure(module) for _ in range(REPEATS)]
+        fastest = min(runs, key=lambda run: run["cumulative_ms"])
+        print(json.dumps(fastest))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Offline end-to-end benchmark of the agent tools against local stand-ins for Calendar, Geocoding, Weather and ipinfo.
+
+Drives each tool at several concurrency levels and prints one JSON object per (tool, concurrency):
+p50/p95/p99/mean/max latency, throughput, error count and per-call allocations (tracemalloc, measured
+in a separate serial pass so tracing doesn't skew the timings). Each line carries the git commit,
+so saved runs can be compared across commits.
+
+Run from the project root:
+    $ python -m benchmarks.bench_tools
+    $ python -m benchmarks.bench_tools --concurrency 1,8,32 --latency-ms 50 --error-rate 0.02 --output results.jsonl
+    $ python -m benchmarks.bench_tools --tools get_events,get_current_weather --events 2000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_apis import FakeApiConfig, FakeApis
+
+TOOL_NAMES = (
+    "get_events", "get_events_all_calendars", "schedule_new_event", "cancel_event", "get_coords_for_place", "get_current_weather",
+    "lookup_location_from_ip", "resolve_time_window", "get_relative_date_and_time", "format_time_to_calendar", "math_tool",
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tools", default=",".join(TOOL_NAMES), help="comma separated tools to run")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="calls per tool per concurrency level")
+    parser.add_argument("--alloc-samples", type=int, default=20, help="serial calls per tool traced for allocations")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="fake API response latency")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="extra random latency, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake API responses that are 503s")
+    parser.add_argument("--payload-bytes", type=int, default=256, help="padding added to each event / response")
+    parser.add_argument("--events", type=int, default=500, help="events in the fake calendar (one every 3 hours from today)")
+    parser.add_argument("--page-size", type=int, default=2500, help="most events the fake calendar returns per page")
+    parser.add_argument("--distinct-keys", type=int, default=0,
+                        help="distinct places/locations per run for the cached tools (0: every call is a cache miss)")
+    parser.add_argument("--event-mirror", action="store_true", help="serve get_events from the local event mirror")
+    parser.add_argument("--recurring", type=int, default=0, help="daily recurring series in the fake calendar, on top of --events")
+    parser.add_argument("--local-recurrence", action="store_true", help="fetch recurring series once and expand them locally")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="append JSON lines to this file instead of printing them")
+    return parser.parse_args(argv)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure_environment(urls: dict, args, data_directory: str) -> None:
+    """Point the tools at the fake servers. Must run before the agent modules are imported."""
+    os.environ["CALENDAR_API_ENDPOINT"] = urls["calendar"]
+    os.environ["GEOCODE_API_URL"] = urls["geocode"]
+    os.environ["WEATHER_API_URL"] = urls["weather"]
+    os.environ["IPINFO_URL"] = urls["ipinfo"]
+    os.environ["GOOGLE_MAPS_API_KEY"] = "benchmark"
+    os.environ["USE_EVENT_MIRROR"] = "true" if args.event_mirror else "false"
+    os.environ["EXPAND_RECURRENCE_LOCALLY"] = "true" if args.local_recurrence else "false"
+    os.environ["EVENT_MIRROR_PATH"] = os.path.join(data_directory, "event_mirror.db")
+    os.environ["GEOCODE_CACHE_PATH"] = os.path.join(data_directory, "geocode_cache.db")
+
+
+def build_scenarios(args) -> dict:
+    """tool name -> fn(run, index) making one call. run is unique per (tool, concurrency, pass) so caches start cold."""
+    from google.oauth2.credentials import Credentials
+
+    from agents.agent.utils import calendar_tools, location_tools, weather_tools
+    from agents.agent.utils.math_and_time_tools import (
+        format_time_to_calendar, get_relative_date_and_time, math_tool, resolve_time_window
+    )
+
+    # A token without an expiry is always valid, so no refresh is attempted
+    creds = Credentials(token="benchmark")
+    calendar_tools.get_creds = lambda: creds
+
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time(), datetime.timezone.utc)
+    window_start = today.isoformat()
+    window_end = (today + datetime.timedelta(hours=3 * args.events)).isoformat()
+    now_iso = datetime.datetime.now().astimezone().isoformat()
+
+    def key(index: int) -> int:
+        return index % args.distinct_keys if args.distinct_keys else index
+
+    def event_params(run: int, index: int) -> dict:
+        # Between two fake events (one hour every three hours) and clear of earlier runs' bookings, which the
+        # event mirror keeps, so the conflict check passes and the event is booked
+        start = today + datetime.timedelta(days=1, hours=3 * (run * args.requests + index) + 1)
+        return {
+            "event_title": f"benchmark {run} {index}",
+            "start_datetime": start.isoformat(),
+            "end_datetime": (start + datetime.timedelta(hours=1)).isoformat(),
+            "description": "x" * args.payload_bytes,
+        }
+
+    def weather_coords(run: int, index: int) -> dict:
+        # 0.1 degree latitude steps and 0.5 degree longitude per run: a different geohash cell for every key
+        return {"lat": -80 + (key(index) % 1600) * 0.1, "lon": -179.5 + (run % 700) * 0.5}
+
+    return {
+        "get_events": lambda run, index: calendar_tools.get_events(window_start, window_end),
+        # Every fake calendar holds the same events, so this also exercises the cross-calendar dedup
+        "get_events_all_calendars": lambda run, index: calendar_tools.get_events(window_start, window_end, calendar_ids=["all"]),
+        "schedule_new_event": lambda run, index: calendar_tools.schedule_new_event(event_params(run, index)),
+        "cancel_event": lambda run, index: calendar_tools.cancel_event(f"cancel{run}x{index}"),
+        "get_coords_for_place": lambda run, index: location_tools.get_coords_for_place(f"benchmark place {run} {key(index)}"),
+        "get_current_weather": lambda run, index: weather_tools.get_current_weather(weather_coords(run, index)),
+        "lookup_location_from_ip": lambda run, index: location_tools.lookup_location_from_ip(),
+        "resolve_time_window": lambda run, index: resolve_time_window("next tuesday evening", now_iso),
+        "get_relative_date_and_time": lambda run, index: get_relative_date_and_time(now_iso, "+ 90 minutes"),
+        "format_time_to_calendar": lambda run, index: format_time_to_calendar(now_iso),
+        "math_tool": lambda run, index: math_tool("sqrt(2) * pi + 3 ** 2"),
+    }
+
+
+def timed_call(call, run: int, index: int) -> tuple:
+    """(latency in ms, succeeded). Tools report failures either by raising or with status 'error'."""
+    started = time.perf_counter()
+    try:
+        result = call(run, index)
+        succeeded = not (isinstance(result, dict) and result.get("status") == "error")
+    except Exception:
+        succeeded = False
+    return (time.perf_counter() - started) * 1000, succeeded
+
+
+def percentile(cut_points: list, p: int) -> float:
+    return round(cut_points[p - 1], 3)
+
+
+def measure_latency(call, run: int, requests: int, concurrency: int) -> dict:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = time.perf_counter()
+        outcomes = list(executor.map(lambda index: timed_call(call, run, index), range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in outcomes]
+    cut_points = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, succeeded in outcomes if not succeeded),
+        "p50_ms": percentile(cut_points, 50),
+        "p95_ms": percentile(cut_points, 95),
+        "p99_ms": percentile(cut_points, 99),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "max_ms": round(max(latencies), 3),
+        "throughput_rps": round(requests / elapsed, 2),
+    }
+
+
+def measure_allocations(call, run: int, samples: int) -> dict:
+    """Peak and retained bytes allocated per call, averaged over serial calls."""
+    peaks = []
+    retained = []
+    tracemalloc.start()
+    try:
+        for index in range(samples):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            timed_call(call, run, index)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "alloc_peak_bytes_per_call": round(statistics.fmean(peaks)) if peaks else 0,
+        "alloc_retained_bytes_per_call": round(statistics.fmean(retained)) if retained else 0,
+    }
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    tools = [name.strip() for name in args.tools.split(",") if name.strip()]
+    unknown = sorted(set(tools) - set(TOOL_NAMES))
+    if unknown:
+        sys.exit(f"Unknown tools: {', '.join(unknown)}. Choose from: {', '.join(TOOL_NAMES)}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    config = FakeApiConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        payload_bytes=args.payload_bytes, events=args.events, page_size=args.page_size, seed=args.seed,
+        recurring=args.recurring,
+    )
+    common = {
+        "benchmark": "tools",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": dict(config.as_dict(), requests=args.requests, distinct_keys=args.distinct_keys, event_mirror=args.event_mirror,
+                       local_recurrence=args.local_recurrence),
+    }
+
+    output = open(args.output, "a") if args.output else sys.stdout
+    try:
+        with FakeApis(config) as apis, tempfile.TemporaryDirectory() as data_directory:
+            configure_environment(apis.urls, args, data_directory)
+            scenarios = build_scenarios(args)
+
+            run = 0
+            for tool in tools:
+                call = scenarios[tool]
+                # Warm up connections, service objects and lazy imports outside the measurements
+                timed_call(call, run, 0)
+                run += 1
+
+                allocations = measure_allocations(call, run, args.alloc_samples)
+                run += 1
+
+                for concurrency in levels:
+                    result = dict(common, tool=tool, concurrency=concurrency)
+                    result.update(measure_latency(call, run, args.requests, concurrency))
+                    result.update(allocations)
+                    run += 1
+                    print(json.dumps(result), file=output, flush=True)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Check that local recurrence expansion (EXPAND_RECURRENCE_LOCALLY) returns the same events as the API's own.
+
+Reads each window twice from a real calendar, once with singleEvents=True and once as series expanded by
+recurrence.expand_events, and compares the events by ID: start, end, title and status. Prints one JSON
+object per window, with the mismatches, and exits non-zero if any window differs.
+
+--create-corpus first adds a shared corpus of recurring series to the calendar, so every rule shape
+is covered whatever the calendar holds: weekday stand-ups across a DST change with a moved and a
+cancelled instance, COUNT with EXDATE, last-Friday-of-the-month with a date-only UNTIL, all-day monthly,
+fortnightly with an RDATE, and a series in another time zone. The corpus is deleted afterwards unless --keep.
+
+The same check runs offline in tests/test_recurrence.py, against a window of the corpus committed as
+tests/fixtures/recurrence_corpus.json. --record PATH writes the first window in that format (both listings,
+as the API returned them), to refresh or extend the fixture from a real calendar.
+
+Needs calendar credentials (and write access for --create-corpus). Run from the project root:
+    $ python -m benchmarks.compare_recurrence
+    $ python -m benchmarks.compare_recurrence --calendar-id team@group.calendar.google.com --create-corpus --days 120
+    $ python -m benchmarks.compare_recurrence --create-corpus --record tests/fixtures/recurrence_corpus.json
+"""
+import sys
+import json
+import argparse
+import datetime
+
+CORPUS_TAG = "recurrence-corpus"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calendar-id", default="primary")
+    parser.add_argument("--days", type=int, default=90, help="length of the longest window compared, starting 30 days ago")
+    parser.add_argument("--create-corpus", action="store_true", help="add the recurring test series to the calendar first")
+    parser.add_argument("--keep", action="store_true", help="leave the corpus in the calendar afterwards")
+    parser.add_argument("--record", metavar="PATH", help="also save the first window's two listings as a test fixture")
+    return parser.parse_args(argv)
+
+
+def corpus_events(today: datetime.date) -> list:
+    """Recurring series covering the rule shapes the expander handles, starting a few weeks before today."""
+    base = today - datetime.timedelta(days=28)
+    monday = base - datetime.timedelta(days=base.weekday())
+
+    def timed(day: datetime.date, hour: int, minute: int, minutes: int, zone: str) -> tuple:
+        start = datetime.datetime.combine(day, datetime.time(hour, minute))
+        return (
+            {"dateTime": start.isoformat(), "timeZone": zone},
+            {"dateTime": (start + datetime.timedelta(minutes=minutes)).isoformat(), "timeZone": zone},
+        )
+
+    def event(title: str, times: tuple, recurrence: list) -> dict:
+        return {
+            "summary": f"{title} ({CORPUS_TAG})",
+            "start": times[0],
+            "end": times[1],
+            "recurrence": recurrence,
+            "extendedProperties": {"private": {CORPUS_TAG: "true"}},
+        }
+
+    until = (base + datetime.timedelta(days=200)).strftime("%Y%m%d")
+    # Series start on one of their own occurrences, so no result depends on how DTSTART outside the rule is treated
+    month_end = (base.replace(day=28) + datetime.timedelta(days=4)).replace(day=1) - datetime.timedelta(days=1)
+    last_friday = month_end - datetime.timedelta(days=(month_end.weekday() - 4) % 7)
+    third_tuesday = monday + datetime.timedelta(days=15)
+    extra_day = monday + datetime.timedelta(days=10)
+
+    return [
+        event("Daily stand-up", timed(monday, 9, 30, 15, "America/New_York"), ["RRULE:FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR"]),
+        event("Weekly 1:1", timed(monday + datetime.timedelta(days=1), 14, 0, 30, "Europe/London"), [
+            "RRULE:FREQ=WEEKLY;COUNT=20",
+            f"EXDATE;TZID=Europe/London:{third_tuesday:%Y%m%d}T140000",
+        ]),
+        event("Monthly review", timed(last_friday, 16, 0, 60, "Asia/Tokyo"), [f"RRULE:FREQ=MONTHLY;BYDAY=-1FR;UNTIL={until}"]),
+        event("Pay day", ({"date": base.replace(day=15).isoformat()}, {"date": base.replace(day=16).isoformat()}),
+              ["RRULE:FREQ=MONTHLY;BYMONTHDAY=15"]),
+        event("Fortnightly sync", timed(monday + datetime.timedelta(days=3), 11, 0, 45, "Australia/Sydney"), [
+            "RRULE:FREQ=WEEKLY;INTERVAL=2",
+            f"RDATE;TZID=Australia/Sydney:{extra_day:%Y%m%d}T110000",
+        ]),
+    ]
+
+
+def create_corpus(service, calendar_id: str, today: datetime.date) -> list:
+    """Insert the corpus, then move the second stand-up by two hours and cancel the fourth. Returns the series IDs."""
+    series_ids = []
+    for body in corpus_events(today):
+        series_ids.append(service.events().insert(calendarId=calendar_id, body=body).execute()["id"])
+
+    standup = series_ids[0]
+    instances = service.events().instances(calendarId=calendar_id, eventId=standup, maxResults=5).execute().get("items", [])
+    if len(instances) >= 4:
+        moved = instances[1]
+        start = datetime.datetime.fromisoformat(moved["start"]["dateTime"]) + datetime.timedelta(hours=2)
+        end = datetime.datetime.fromisoformat(moved["end"]["dateTime"]) + datetime.timedelta(hours=2)
+        service.events().patch(calendarId=calendar_id, eventId=moved["id"], body={
+            "summary": moved["summary"] + " (moved)",
+            "start": {"dateTime": start.isoformat(), "timeZone": moved["start"].get("timeZone")},
+            "end": {"dateTime": end.isoformat(), "timeZone": moved["end"].get("timeZone")},
+        }).execute()
+        service.events().delete(calendarId=calendar_id, eventId=instances[3]["id"]).execute()
+
+    return series_ids
+
+
+def comparable(event: dict) -> dict:
+    from agents.agent.utils.event_store import event_time_to_timestamp
+
+    return {
+        "start": event_time_to_timestamp(event["start"]),
+        "end": event_time_to_timestamp(event["end"]),
+        "summary": event.get("summary"),
+        "status": event.get("status"),
+    }
+
+
+def compare_window(creds, calendar_id: str, time_min: str, time_max: str) -> dict:
+    from agents.agent.utils.calendar_tools import iter_events, iter_expanded_events
+
+    server = [comparable(event) | {"id": event["id"]} for event in iter_events(creds, time_min, time_max, calendar_id=calendar_id)]
+    local = [comparable(event) | {"id": event["id"]} for event in iter_expanded_events(creds, time_min, time_max, calendar_id=calendar_id)]
+
+    server_by_id = {event.pop("id"): event for event in server}
+    local_by_id = {event.pop("id"): event for event in local}
+
+    mismatches = []
+    for event_id in sorted(server_by_id.keys() | local_by_id.keys()):
+        expected = server_by_id.get(event_id)
+        actual = local_by_id.get(event_id)
+        if expected != actual:
+            mismatches.append({"id": event_id, "server": expected, "local": actual})
+
+    # Same events in a different order would still change what get_events returns under a limit
+    server_order = [event["start"] for event in server]
+    local_order = [event["start"] for event in local]
+
+    return {
+        "time_min": time_min,
+        "time_max": time_max,
+        "server_events": len(server),
+        "local_events": len(local),
+        "order_matches": server_order == local_order,
+        "mismatches": mismatches,
+    }
+
+
+def record_window(creds, calendar_id: str, time_min: str, time_max: str, path: str) -> None:
+    """Save a window listed both ways, in the format tests/test_recurrence.py reads."""
+    from agents.agent.utils.calendar_tools import iter_events, list_series_events, SERIES_EVENT_FIELDS
+
+    fixture = {
+        "description": f"Recorded by benchmarks/compare_recurrence.py from {calendar_id}",
+        "time_min": time_min,
+        "time_max": time_max,
+        "series": list_series_events(creds, time_min, time_max, calendar_id=calendar_id),
+        "instances": list(iter_events(creds, time_min, time_max, calendar_id=calendar_id, fields=SERIES_EVENT_FIELDS)),
+    }
+    with open(path, "w") as f:
+        json.dump(fixture, f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+
+    from agents.agent.utils.calendar_service import calendar_service
+    from agents.agent.utils.handle_credentials import get_creds
+    from agents.agent.utils.math_and_time_tools import to_calendar_time
+
+    creds = get_creds()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    windows = [
+        (now - datetime.timedelta(days=30), now - datetime.timedelta(days=30) + datetime.timedelta(days=args.days)),
+        (now, now + datetime.timedelta(days=7)),
+        (now + datetime.timedelta(days=1), now + datetime.timedelta(days=1, hours=12)),
+    ]
+
+    series_ids = []
+    failed = False
+    try:
+        if args.create_corpus:
+            with calendar_service(creds) as service:
+                series_ids = create_corpus(service, args.calendar_id, now.date())
+
+        if args.record:
+            record_window(creds, args.calendar_id, to_calendar_time(windows[0][0]), to_calendar_time(windows[0][1]), args.record)
+
+        for start, end in windows:
+            result = compare_window(creds, args.calendar_id, to_calendar_time(start), to_calendar_time(end))
+            failed = failed or bool(result["mismatches"]) or not result["order_matches"]
+            print(json.dumps(result), flush=True)
+    finally:
+        if series_ids and not args.keep:
+            with calendar_service(creds) as service:
+                for series_id in series_ids:
+                    service.events().delete(calendarId=args.calendar_id, eventId=series_id).execute()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
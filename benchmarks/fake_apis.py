@@ -0,0 +1,353 @@
+"""
+Local stand-ins for the Google Calendar, Geocoding, Weather and ipinfo APIs, so tools can be benchmarked offline.
+
+Each API gets its own HTTP/1.1 keep-alive server, all running in a child process so the servers
+don't compete with the code being measured for the GIL or show up in its allocations.
+Latency, jitter, response padding, page size, error rate and the number of recurring series are configurable.
+
+    with FakeApis(latency_ms=20, error_rate=0.01) as apis:
+        apis.urls["calendar"]  # e.g. 'http://127.0.0.1:51234/calendar/v3/'
+"""
+import re
+import json
+import time
+import random
+import datetime
+import threading
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+API_NAMES = ("calendar", "geocode", "weather", "ipinfo")
+
+# The Calendar API never returns more than this many events per page, whatever maxResults asks for
+CALENDAR_MAX_PAGE_SIZE = 2500
+
+EVENTS_PATH = re.compile(r"^/calendar/v3/calendars/([^/]+)/events/?$")
+EVENT_PATH = re.compile(r"^/calendar/v3/calendars/([^/]+)/events/([^/]+)$")
+CALENDAR_LIST_PATH = "/calendar/v3/users/me/calendarList"
+
+FAKE_CALENDARS = [
+    {"id": "benchmark@example.com", "summary": "benchmark@example.com", "primary": True, "accessRole": "owner", "timeZone": "Europe/London"},
+    {"id": "team@group.calendar.example.com", "summary": "Team", "accessRole": "writer", "timeZone": "Europe/London"},
+    {"id": "en.uk#holiday@group.v.calendar.google.com", "summary": "Holidays in United Kingdom", "accessRole": "reader", "timeZone": "Europe/London"},
+]
+
+
+class FakeApiConfig:
+    """How the fake servers behave. Everything is plain data so it can be sent to the server process."""
+
+    def __init__(self, latency_ms: float = 20.0, jitter_ms: float = 5.0, error_rate: float = 0.0,
+                 payload_bytes: int = 256, events: int = 500, page_size: int = CALENDAR_MAX_PAGE_SIZE, seed: int = 0,
+                 recurring: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.payload_bytes = payload_bytes
+        self.events = events
+        self.page_size = page_size
+        self.seed = seed
+        self.recurring = recurring
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def padding(size: int) -> str:
+    return "x" * max(size, 0)
+
+
+def fake_calendar_events(config: FakeApiConfig) -> list:
+    """config.events events, one every 3 hours from the start of today (UTC), in start time order."""
+    midnight = datetime.datetime.combine(datetime.date.today(), datetime.time(), datetime.timezone.utc)
+    events = []
+    for index in range(config.events):
+        start = midnight + datetime.timedelta(hours=3 * index)
+        events.append({
+            "id": f"evt{index:06d}",
+            "iCalUID": f"evt{index:06d}@benchmark",
+            "status": "confirmed",
+            "summary": f"Benchmark Event {index}",
+            "description": padding(config.payload_bytes),
+            "location": "Meeting Room 2",
+            "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": (start + datetime.timedelta(hours=1)).isoformat()},
+            "attendees": [{"email": "alex@example.com", "responseStatus": "accepted"}],
+        })
+    return events
+
+
+def fake_recurring_series(config: FakeApiConfig) -> list:
+    """
+    config.recurring daily series from today (UTC), each 30 minutes long and between the single events,
+    e.g. a daily stand-up. UTC series have no DST, so their instances are simple to expand here.
+    """
+    midnight = datetime.datetime.combine(datetime.date.today(), datetime.time(), datetime.timezone.utc)
+    series = []
+    for index in range(config.recurring):
+        start = midnight + datetime.timedelta(hours=3 * (index % 8) + 1, minutes=30)
+        series.append({
+            "id": f"series{index:06d}",
+            "iCalUID": f"series{index:06d}@benchmark",
+            "status": "confirmed",
+            "summary": f"Benchmark Series {index}",
+            "description": padding(config.payload_bytes),
+            "location": "Meeting Room 2",
+            "start": {"dateTime": start.isoformat(), "timeZone": "UTC"},
+            "end": {"dateTime": (start + datetime.timedelta(minutes=30)).isoformat(), "timeZone": "UTC"},
+            "recurrence": ["RRULE:FREQ=DAILY"],
+        })
+    return series
+
+
+def series_instances(master: dict, time_min: datetime.datetime, time_max: datetime.datetime) -> list:
+    """The instances events.list(singleEvents=True) returns for a daily UTC series: those overlapping [time_min, time_max)."""
+    first = parse_time(master["start"]["dateTime"])
+    duration = parse_time(master["end"]["dateTime"]) - first
+    day = datetime.timedelta(days=1)
+    start = first + max((time_min - duration - first) // day + 1, 0) * day
+
+    instances = []
+    while start < time_max:
+        instance = {key: value for key, value in master.items() if key != "recurrence"}
+        instance["id"] = f"{master['id']}_{start:%Y%m%dT%H%M%SZ}"
+        instance["start"] = {"dateTime": start.isoformat(), "timeZone": "UTC"}
+        instance["end"] = {"dateTime": (start + duration).isoformat(), "timeZone": "UTC"}
+        instance["recurringEventId"] = master["id"]
+        instance["originalStartTime"] = dict(instance["start"])
+        instances.append(instance)
+        start += day
+    return instances
+
+
+def parse_time(value: str) -> datetime.datetime:
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+class FakeCalendar:
+    """
+    calendarList.list, plus events.list (with pagination, syncTokens and recurring series expanded or not,
+    following singleEvents), events.insert and events.delete for any calendar.
+    """
+
+    def __init__(self, config: FakeApiConfig):
+        self.config = config
+        self.events = fake_calendar_events(config)
+        self.starts = [parse_time(event["start"]["dateTime"]) for event in self.events]
+        self.series = fake_recurring_series(config)
+        self.horizon = max(self.starts, default=datetime.datetime.now(datetime.timezone.utc)) + datetime.timedelta(days=1)
+        self.deleted = set()
+        self.next_id = 0
+        self.lock = threading.Lock()
+
+    def handle(self, method: str, path: str, query: dict, body: bytes) -> tuple:
+        if path == CALENDAR_LIST_PATH and method == "GET":
+            return 200, {"items": FAKE_CALENDARS}
+
+        match = EVENTS_PATH.match(path)
+        if match and method == "GET":
+            return self.list_events(query)
+        if match and method == "POST":
+            return self.insert_event(json.loads(body or b"{}"))
+
+        match = EVENT_PATH.match(path)
+        if match and method == "DELETE":
+            return self.delete_event(match.group(2))
+
+        return 404, {"error": {"code": 404, "message": f"Not found: {method} {path}"}}
+
+    def list_events(self, query: dict) -> tuple:
+        # Incremental syncs see no changes, the stand-in calendar never changes by itself
+        if "syncToken" in query:
+            return 200, {"items": [], "nextSyncToken": query["syncToken"]}
+
+        time_min = parse_time(query["timeMin"]) if "timeMin" in query else datetime.datetime.fromtimestamp(0, datetime.timezone.utc)
+        # Open-ended listings (a mirror's full sync) stop where the single events do, not at the end of time
+        time_max = parse_time(query["timeMax"]) if "timeMax" in query else self.horizon
+        window = [event for event, start in zip(self.events, self.starts) if time_min <= start < time_max]
+
+        if query.get("singleEvents") == "true":
+            for master in self.series:
+                window.extend(series_instances(master, time_min, time_max))
+            window.sort(key=lambda event: parse_time(event["start"]["dateTime"]))
+        else:
+            window.extend(master for master in self.series if parse_time(master["start"]["dateTime"]) < time_max)
+
+        offset = int(query.get("pageToken", 0))
+        page_size = min(int(query.get("maxResults", 250)), self.config.page_size)
+        page = {"items": window[offset:offset + page_size]}
+        if offset + page_size < len(window):
+            page["nextPageToken"] = str(offset + page_size)
+        else:
+            page["nextSyncToken"] = "benchmark-sync-token"
+        return 200, page
+
+    def insert_event(self, event: dict) -> tuple:
+        with self.lock:
+            self.next_id += 1
+            event_id = f"new{self.next_id:06d}"
+        return 200, dict(event, id=event_id, status="confirmed", htmlLink=f"https://calendar.example.com/{event_id}")
+
+    def delete_event(self, event_id: str) -> tuple:
+        with self.lock:
+            if event_id in self.deleted:
+                return 410, {"error": {"code": 410, "message": "Resource has been deleted"}}
+            self.deleted.add(event_id)
+        return 204, None
+
+
+def fake_geocode(config: FakeApiConfig, query: dict) -> tuple:
+    address = query.get("address", "")
+    if not address:
+        return 200, {"status": "ZERO_RESULTS", "results": []}
+
+    # Stable, well spread coordinates per address
+    rng = random.Random(address)
+    return 200, {
+        "status": "OK",
+        "results": [{
+            "formatted_address": address.title(),
+            "geometry": {"location": {"lat": round(rng.uniform(-60, 60), 6), "lng": round(rng.uniform(-180, 180), 6)}},
+            "place_id": padding(config.payload_bytes),
+        }],
+    }
+
+
+def fake_weather(config: FakeApiConfig, query: dict) -> tuple:
+    return 200, {
+        "currentTime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "timeZone": {"id": "Europe/London"},
+        "isDaytime": True,
+        "weatherCondition": {"description": {"text": "Partly cloudy", "languageCode": "en"}, "type": "PARTLY_CLOUDY"},
+        "temperature": {"degrees": 13.7, "unit": "CELSIUS"},
+        "feelsLikeTemperature": {"degrees": 12.1, "unit": "CELSIUS"},
+        "relativeHumidity": 71,
+        "precipitation": {"probability": {"percent": 10, "type": "RAIN"}},
+        "wind": {"speed": {"value": 14, "unit": "KILOMETERS_PER_HOUR"}},
+        "location": {"latitude": query.get("location.latitude"), "longitude": query.get("location.longitude")},
+        "padding": padding(config.payload_bytes),
+    }
+
+
+def fake_ipinfo(config: FakeApiConfig, query: dict) -> tuple:
+    return 200, {"ip": "203.0.113.7", "city": "London", "region": "England", "country": "GB", "loc": "51.5072,-0.1276"}
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the client's delayed ACK adds ~40ms
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.respond("GET")
+
+    def do_POST(self):
+        self.respond("POST")
+
+    def do_DELETE(self):
+        self.respond("DELETE")
+
+    def respond(self, method: str) -> None:
+        server = self.server
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        config = server.config
+        time.sleep((config.latency_ms + server.rng.uniform(0, config.jitter_ms)) / 1000.0)
+
+        if config.error_rate and server.rng.random() < config.error_rate:
+            status, payload = 503, {"error": {"code": 503, "message": "Backend Error", "status": "UNAVAILABLE"}}
+        else:
+            status, payload = server.route(method, parts.path, query, body)
+
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, name: str, config: FakeApiConfig):
+        super().__init__(("127.0.0.1", 0), FakeApiHandler)
+        self.name = name
+        self.config = config
+        # random.Random is thread-safe for these calls; seeded per API so runs are repeatable
+        self.rng = random.Random(f"{config.seed}-{name}")
+        self.calendar = FakeCalendar(config) if name == "calendar" else None
+
+    def route(self, method: str, path: str, query: dict, body: bytes) -> tuple:
+        if self.calendar is not None:
+            return self.calendar.handle(method, path, query, body)
+        if self.name == "geocode":
+            return fake_geocode(self.config, query)
+        if self.name == "weather":
+            return fake_weather(self.config, query)
+        return fake_ipinfo(self.config, query)
+
+
+def api_url(name: str, port: int) -> str:
+    base = f"http://127.0.0.1:{port}"
+    return {
+        "calendar": f"{base}/calendar/v3/",
+        "geocode": f"{base}/maps/api/geocode/json",
+        "weather": f"{base}/v1/currentConditions:lookup",
+        "ipinfo": f"{base}/json",
+    }[name]
+
+
+def serve(config_dict: dict, ports, stop) -> None:
+    """Server process entry point: start one server per API, report their ports, run until stop is set."""
+    config = FakeApiConfig(**config_dict)
+    servers = [FakeApiServer(name, config) for name in API_NAMES]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    ports.put({server.name: server.server_address[1] for server in servers})
+
+    stop.wait()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class FakeApis:
+    """Runs the fake API servers in a child process for the duration of a with block."""
+
+    def __init__(self, config: FakeApiConfig = None, **options):
+        self.config = config or FakeApiConfig(**options)
+        self.urls = {}
+        self._process = None
+        self._stop = None
+
+    def start(self) -> dict:
+        context = multiprocessing.get_context("spawn")
+        ports = context.Queue()
+        self._stop = context.Event()
+        self._process = context.Process(target=serve, args=(self.config.as_dict(), ports, self._stop), daemon=True)
+        self._process.start()
+        self.urls = {name: api_url(name, port) for name, port in ports.get(timeout=30).items()}
+        return self.urls
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._stop.set()
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
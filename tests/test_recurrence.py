@@ -0,0 +1,73 @@
+import json
+import time
+import datetime
+from pathlib import Path
+
+import pytest
+
+from agents.agent.utils.event_store import event_time_to_timestamp
+from agents.agent.utils.recurrence import expand_events
+
+CORPUS_PATH = Path(__file__).parent / "fixtures" / "recurrence_corpus.json"
+
+
+@pytest.fixture(autouse=True)
+def utc_local_time(monkeypatch):
+    # All-day events are read in local time; pin it so their place in the start time order is fixed
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    with open(CORPUS_PATH) as f:
+        return json.load(f)
+
+
+def comparable(event: dict) -> tuple:
+    return (
+        event["id"],
+        event_time_to_timestamp(event["start"]),
+        event_time_to_timestamp(event["end"]),
+        event.get("summary"),
+        event.get("status"),
+    )
+
+
+def parse(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value)
+
+
+def test_expansion_matches_single_events_listing(corpus):
+    local = expand_events(corpus["series"], parse(corpus["time_min"]), parse(corpus["time_max"]))
+
+    assert [comparable(event) for event in local] == [comparable(event) for event in corpus["instances"]]
+
+
+@pytest.mark.parametrize("time_min, time_max", [
+    ("2025-03-03T00:00:00Z", "2025-03-03T00:00:01Z"),
+    ("2025-03-04T14:15:00Z", "2025-03-04T16:45:00Z"),
+    ("2025-03-06T00:00:00Z", "2025-03-07T00:00:00Z"),
+    ("2025-03-09T00:00:00Z", "2025-03-12T00:00:00Z"),
+    ("2025-03-14T12:00:00Z", "2025-03-17T00:00:00Z"),
+    ("2025-03-16T08:00:00Z", "2025-03-17T00:00:00Z"),
+])
+def test_expansion_matches_narrower_windows(corpus, time_min, time_max):
+    start, end = parse(time_min), parse(time_max)
+    expected = [
+        event for event in corpus["instances"]
+        if event_time_to_timestamp(event["start"]) < end.timestamp() and event_time_to_timestamp(event["end"]) > start.timestamp()
+    ]
+
+    local = expand_events(corpus["series"], start, end)
+
+    assert [comparable(event) for event in local] == [comparable(event) for event in expected]
+
+
+def test_instances_keep_their_series(corpus):
+    local = list(expand_events(corpus["series"], parse(corpus["time_min"]), parse(corpus["time_max"])))
+
+    assert [event.get("recurringEventId") for event in local] == [event.get("recurringEventId") for event in corpus["instances"]]
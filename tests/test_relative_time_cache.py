@@ -0,0 +1,51 @@
+import random
+import datetime
+
+import dateparser
+import pytest
+
+from agents.agent.utils.math_and_time_tools import parse_relative_phrase, phrase_is_offset, relative_time_cache
+
+PHRASES = [
+    "in 20 seconds", "30 seconds ago", "in 1 minute 30 seconds", "in 5 minutes", "in 3 hours", "2 hours ago",
+    "tomorrow", "yesterday", "in 2 days", "in 1 week", "now", "today",
+    "at 4pm", "tomorrow at 9am", "friday", "next monday", "noon", "3 days ago at 10:15",
+]
+
+
+def anchors(seed: int, count: int) -> list:
+    """Anchors spread over a few days, many sharing an hour or a day so the cache gets hit."""
+    rng = random.Random(seed)
+    base = datetime.datetime(2027, 3, 12, 9, 0)
+    return [
+        base + datetime.timedelta(days=rng.randint(0, 2), hours=rng.choice([0, 0, 1, 6]), minutes=rng.randint(0, 59),
+                                  seconds=rng.choice([0, rng.randint(0, 59)]), microseconds=rng.choice([0, rng.randint(0, 999999)]))
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    relative_time_cache.clear()
+    phrase_is_offset.clear()
+    yield
+    relative_time_cache.clear()
+    phrase_is_offset.clear()
+
+
+@pytest.mark.parametrize("phrase", PHRASES)
+@pytest.mark.parametrize("tzinfo", [None, datetime.timezone.utc], ids=["naive", "utc"])
+def test_cached_matches_dateparser(phrase, tzinfo):
+    for anchor in anchors(seed=len(phrase), count=30):
+        anchor = anchor.replace(tzinfo=tzinfo)
+        expected = dateparser.parse(phrase, settings={"RELATIVE_BASE": anchor})
+
+        assert parse_relative_phrase(phrase, anchor) == expected, (phrase, anchor)
+
+
+def test_seconds_offset_follows_the_anchor():
+    morning = datetime.datetime(2027, 3, 12, 9, 0)
+    afternoon = datetime.datetime(2027, 3, 12, 15, 30)
+
+    assert parse_relative_phrase("in 20 seconds", morning) == datetime.datetime(2027, 3, 12, 9, 0, 20)
+    assert parse_relative_phrase("in 20 seconds", afternoon) == datetime.datetime(2027, 3, 12, 15, 30, 20)
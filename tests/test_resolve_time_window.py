@@ -0,0 +1,92 @@
+import datetime
+
+import pytest
+
+from agents.agent.utils.math_and_time_tools import next_period_start, resolve_time_window
+
+# Tuesday 2 Nov 2027, 15:00 UTC: the "now" used by the resolve_time_window docstring examples
+NOW = "2027-11-02T15:00:00+00:00"
+
+
+@pytest.mark.parametrize("phrase, start, end", [
+    # this/next/last week, month and year
+    ("this week", "2027-11-02T15:00:00+00:00", "2027-11-08T00:00:00+00:00"),
+    ("next week", "2027-11-08T00:00:00+00:00", "2027-11-15T00:00:00+00:00"),
+    ("last week", "2027-10-25T00:00:00+00:00", "2027-11-01T00:00:00+00:00"),
+    ("this month", "2027-11-02T15:00:00+00:00", "2027-12-01T00:00:00+00:00"),
+    ("next month", "2027-12-01T00:00:00+00:00", "2028-01-01T00:00:00+00:00"),
+    ("last month", "2027-10-01T00:00:00+00:00", "2027-11-01T00:00:00+00:00"),
+    ("this year", "2027-11-02T15:00:00+00:00", "2028-01-01T00:00:00+00:00"),
+    ("next year", "2028-01-01T00:00:00+00:00", "2029-01-01T00:00:00+00:00"),
+    ("last year", "2026-01-01T00:00:00+00:00", "2027-01-01T00:00:00+00:00"),
+    # Bare, this, next and last weekdays; today is a Tuesday
+    ("Friday", "2027-11-05T00:00:00+00:00", "2027-11-06T00:00:00+00:00"),
+    ("Tuesday", "2027-11-09T00:00:00+00:00", "2027-11-10T00:00:00+00:00"),
+    ("this Friday", "2027-11-05T00:00:00+00:00", "2027-11-06T00:00:00+00:00"),
+    ("this Tuesday", "2027-11-02T00:00:00+00:00", "2027-11-03T00:00:00+00:00"),
+    ("next Tuesday", "2027-11-09T00:00:00+00:00", "2027-11-10T00:00:00+00:00"),
+    ("next wed", "2027-11-03T00:00:00+00:00", "2027-11-04T00:00:00+00:00"),
+    ("last Friday", "2027-10-29T00:00:00+00:00", "2027-10-30T00:00:00+00:00"),
+    ("last Tuesday", "2027-10-26T00:00:00+00:00", "2027-10-27T00:00:00+00:00"),
+    # Days and times of day
+    ("today", "2027-11-02T00:00:00+00:00", "2027-11-03T00:00:00+00:00"),
+    ("tomorrow", "2027-11-03T00:00:00+00:00", "2027-11-04T00:00:00+00:00"),
+    ("yesterday", "2027-11-01T00:00:00+00:00", "2027-11-02T00:00:00+00:00"),
+    ("tomorrow evening", "2027-11-03T17:00:00+00:00", "2027-11-03T20:00:00+00:00"),
+    ("tonight", "2027-11-02T19:00:00+00:00", "2027-11-03T00:00:00+00:00"),
+    ("mid-morning", "2027-11-02T10:00:00+00:00", "2027-11-02T10:00:00+00:00"),
+    ("Friday mid-morning", "2027-11-05T10:00:00+00:00", "2027-11-05T10:00:00+00:00"),
+    ("on Friday afternoon", "2027-11-05T12:00:00+00:00", "2027-11-05T17:00:00+00:00"),
+    ("next Monday early afternoon", "2027-11-08T12:00:00+00:00", "2027-11-08T14:30:00+00:00"),
+])
+def test_resolve_time_window(phrase, start, end):
+    result = resolve_time_window(phrase, NOW)
+
+    assert result["status"] == "success"
+    assert (result["start"], result["end"]) == (start, end)
+
+
+def test_midpoint_is_the_middle_of_the_window():
+    assert resolve_time_window("tomorrow evening", NOW)["midpoint"] == "2027-11-03T18:30:00+00:00"
+    assert resolve_time_window("mid-morning", NOW)["midpoint"] == "2027-11-02T10:00:00+00:00"
+
+
+def test_timezone_argument_converts_now():
+    result = resolve_time_window("tomorrow", NOW, tz="America/New_York")
+
+    assert (result["start"], result["end"]) == ("2027-11-03T00:00:00-04:00", "2027-11-04T00:00:00-04:00")
+
+
+@pytest.mark.parametrize("phrase, now, tz", [
+    ("", NOW, None),
+    ("   ", NOW, None),
+    ("next week evening", NOW, None),
+    ("this month morning", NOW, None),
+    ("next fortnight", NOW, None),
+    ("sometime soon", NOW, None),
+    ("next Friday", NOW, "Mars/Olympus_Mons"),
+    ("next Friday", "not a timestamp", None),
+])
+def test_resolve_time_window_errors(phrase, now, tz):
+    result = resolve_time_window(phrase, now, tz)
+
+    assert result["status"] == "error"
+    assert result["message"]
+
+
+@pytest.mark.parametrize("start, period, expected", [
+    (datetime.datetime(2027, 12, 1), "month", datetime.datetime(2028, 1, 1)),
+    (datetime.datetime(2027, 11, 1), "month", datetime.datetime(2027, 12, 1)),
+    (datetime.datetime(2027, 12, 27), "week", datetime.datetime(2028, 1, 3)),
+    (datetime.datetime(2027, 1, 1), "year", datetime.datetime(2028, 1, 1)),
+])
+def test_next_period_start(start, period, expected):
+    assert next_period_start(start, period) == expected
+
+
+def test_december_rolls_over_into_january():
+    december = "2027-12-15T09:00:00+00:00"
+
+    assert resolve_time_window("this month", december)["end"] == "2028-01-01T00:00:00+00:00"
+    assert resolve_time_window("next month", december)["start"] == "2028-01-01T00:00:00+00:00"
+    assert resolve_time_window("next month", december)["end"] == "2028-02-01T00:00:00+00:00"